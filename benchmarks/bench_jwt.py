@@ -0,0 +1,68 @@
+"""
+JWT encode/decode throughput: python-jose per-call API vs the prepared JWTCodec.
+
+    PYTHONPATH=src python benchmarks/bench_jwt.py
+"""
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+from core.security.jwt_codec import JWTCodec
+from core.security.keys import KeyRing
+import time
+import timeit
+
+
+def ops_per_sec(func) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return number / min(timer.repeat(repeat=3, number=number))
+
+
+def bench(algorithm: str, ring: KeyRing) -> None:
+    codec = JWTCodec(ring)
+    claims = {"sub": "1", "type": "access", "exp": int(time.time()) + 3600}
+
+    jose_token = jwt.encode(
+        claims, ring.signing_key, algorithm=algorithm, headers=ring.headers
+    )
+    codec_token = codec.encode(claims)
+
+    results = {
+        "jose encode": ops_per_sec(
+            lambda: jwt.encode(
+                claims, ring.signing_key, algorithm=algorithm, headers=ring.headers
+            )
+        ),
+        "codec encode": ops_per_sec(lambda: codec.encode(claims)),
+        "jose decode": ops_per_sec(
+            lambda: jwt.decode(
+                jose_token,
+                ring.verification_key(jwt.get_unverified_header(jose_token).get("kid")),
+                algorithms=[algorithm],
+            )
+        ),
+        "codec decode": ops_per_sec(lambda: codec.decode(codec_token)),
+    }
+    for name, value in results.items():
+        print(f"{algorithm:6} {name:13} {value:>12,.0f} ops/sec")
+
+
+def main() -> None:
+    bench("HS256", KeyRing(algorithm="HS256", secret_key="x" * 32))
+
+    private_pem = rsa.generate_private_key(
+        public_exponent=65537, key_size=2048
+    ).private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    bench(
+        "RS256",
+        KeyRing(algorithm="RS256", secret_key="", private_key_pem=private_pem),
+    )
+
+
+if __name__ == "__main__":
+    main()
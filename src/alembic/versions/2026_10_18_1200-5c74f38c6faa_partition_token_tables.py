@@ -0,0 +1,179 @@
+"""partition token tables by expires_at
+
+Revision ID: 5c74f38c6faa
+Revises: d312a9875c76
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from core.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "5c74f38c6faa"
+down_revision: Union[str, Sequence[str], None] = "d312a9875c76"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# DDL is inlined so later changes to the app never alter this revision
+def create_partition_sql(table: str, day) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table}_p{day:%Y%m%d} "
+        f"PARTITION OF {table} "
+        f"FOR VALUES FROM ('{day.isoformat()} 00:00:00+00') "
+        f"TO ('{(day + timedelta(days=1)).isoformat()} 00:00:00+00')"
+    )
+
+
+def create_default_partition_sql(table: str) -> str:
+    return f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"
+
+
+def _days_ahead() -> int:
+    # same sizing as maintain_partitions: every token lifetime must fit
+    return max(
+        settings.sweeper.partition_days_ahead, settings.jwt.refresh_expire_day + 1
+    )
+
+
+def _columns(table: str) -> list[sa.Column]:
+    columns = [sa.Column("user_id", sa.Integer(), nullable=False)]
+    if table == "refresh_tokens":
+        columns.append(sa.Column("jti", sa.String(), nullable=False))
+    else:
+        columns += [
+            sa.Column("lookup_hash", sa.String(), nullable=False),
+            sa.Column("hashed_token", sa.String(), nullable=False),
+        ]
+    columns.append(sa.Column("expires_at", sa.TIMESTAMP(timezone=True), nullable=False))
+    if table == "user_tokens":
+        columns.append(
+            sa.Column(
+                "token_type",
+                sa.Enum(
+                    "reset_password",
+                    "verify_email",
+                    name="tokentypeenum",
+                    native_enum=False,
+                ),
+                nullable=False,
+            )
+        )
+    columns += [
+        # keep the existing sequence so ids continue where they left off
+        sa.Column(
+            "id",
+            sa.Integer(),
+            autoincrement=False,
+            server_default=sa.text(f"nextval('{table}_id_seq'::regclass)"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f(f"fk_{table}_user_id_users"),
+            ondelete="CASCADE",
+        ),
+    ]
+    return columns
+
+
+def _lookup_column(table: str) -> str:
+    return "jti" if table == "refresh_tokens" else "lookup_hash"
+
+
+def _rename_old(table: str) -> None:
+    op.rename_table(table, f"{table}_old")
+    op.execute(f"ALTER INDEX pk_{table} RENAME TO pk_{table}_old")
+    column = _lookup_column(table)
+    op.execute(f"ALTER INDEX ix_{table}_{column} RENAME TO ix_{table}_old_{column}")
+
+
+def _move_rows_and_drop_old(table: str) -> None:
+    column_names = ", ".join(
+        column.name for column in _columns(table) if isinstance(column, sa.Column)
+    )
+    op.execute(
+        f"INSERT INTO {table} ({column_names}) "
+        f"SELECT {column_names} FROM {table}_old WHERE expires_at > now()"
+    )
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.drop_table(f"{table}_old")
+
+
+def _partition(table: str) -> None:
+    # the primary key becomes (id, expires_at) and the jti/lookup_hash
+    # indexes lose their unique constraint: Postgres only allows unique
+    # constraints on partitioned tables that include the partition key.
+    # Both values are random, uniqueness is no longer enforced by the DB.
+    _rename_old(table)
+
+    op.create_table(
+        table,
+        *_columns(table),
+        sa.PrimaryKeyConstraint("id", "expires_at", name=op.f(f"pk_{table}")),
+        postgresql_partition_by="RANGE (expires_at)",
+    )
+    column = _lookup_column(table)
+    op.create_index(op.f(f"ix_{table}_{column}"), table, [column], unique=False)
+
+    today = datetime.now(timezone.utc).date()
+    last_day = (
+        op.get_bind()
+        .execute(sa.text(f"SELECT max(expires_at) FROM {table}_old"))
+        .scalar()
+    )
+    last_day = max(
+        today + timedelta(days=_days_ahead()),
+        last_day.date() if last_day else today,
+    )
+
+    op.execute(create_default_partition_sql(table))
+    day = today
+    while day <= last_day:
+        op.execute(create_partition_sql(table, day))
+        day += timedelta(days=1)
+
+    _move_rows_and_drop_old(table)
+
+
+def _unpartition(table: str) -> None:
+    _rename_old(table)
+
+    op.create_table(
+        table,
+        *_columns(table),
+        sa.PrimaryKeyConstraint("id", name=op.f(f"pk_{table}")),
+    )
+    column = _lookup_column(table)
+    op.create_index(op.f(f"ix_{table}_{column}"), table, [column], unique=True)
+
+    _move_rows_and_drop_old(table)
+
+
+def upgrade() -> None:
+    _partition("refresh_tokens")
+    _partition("user_tokens")
+
+
+def downgrade() -> None:
+    _unpartition("user_tokens")
+    _unpartition("refresh_tokens")
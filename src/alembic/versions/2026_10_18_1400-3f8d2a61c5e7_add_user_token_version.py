@@ -0,0 +1,29 @@
+"""add User.token_version
+
+Revision ID: 3f8d2a61c5e7
+Revises: 9b1e4c27a0d3
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "3f8d2a61c5e7"
+down_revision: Union[str, Sequence[str], None] = "9b1e4c27a0d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "token_version")
@@ -0,0 +1,30 @@
+"""index user_tokens by user, type and creation time
+
+Revision ID: 7d2e5b9c1f34
+Revises: c41a7e9d2b58
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7d2e5b9c1f34"
+down_revision: Union[str, Sequence[str], None] = "c41a7e9d2b58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_user_tokens_user_id_token_type_created_at",
+        "user_tokens",
+        ["user_id", "token_type", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_tokens_user_id_token_type_created_at", "user_tokens")
@@ -0,0 +1,56 @@
+"""lower-case stored user emails
+
+Revision ID: a6c3f19e8b72
+Revises: 7d2e5b9c1f34
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a6c3f19e8b72"
+down_revision: Union[str, Sequence[str], None] = "7d2e5b9c1f34"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # emails are looked up lower-cased from now on, so accounts whose emails
+    # differ only by case could no longer log in. They have to be merged or
+    # renamed by hand first.
+    collisions = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT lower(trim(email)) AS email, array_agg(id ORDER BY id) "
+                "FROM users GROUP BY lower(trim(email)) HAVING count(*) > 1"
+            )
+        )
+        .all()
+    )
+    if collisions:
+        details = "; ".join(f"{email}: ids {ids}" for email, ids in collisions)
+        raise RuntimeError(
+            "Users whose emails differ only by case must be resolved before "
+            f"this migration: {details}"
+        )
+
+    op.execute(
+        "UPDATE users SET email = lower(trim(email)) "
+        "WHERE email <> lower(trim(email))"
+    )
+    op.create_index(
+        "ux_users_email_lower",
+        "users",
+        [sa.text("lower(email)")],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    # the original casing is not kept
+    op.drop_index("ux_users_email_lower", "users")
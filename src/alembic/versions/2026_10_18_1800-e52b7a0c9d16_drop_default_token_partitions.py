@@ -0,0 +1,77 @@
+"""drop the default token partitions
+
+Revision ID: e52b7a0c9d16
+Revises: a6c3f19e8b72
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from core.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "e52b7a0c9d16"
+down_revision: Union[str, Sequence[str], None] = "a6c3f19e8b72"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITIONED_TABLES = ("refresh_tokens", "user_tokens")
+
+
+# DDL is inlined so later changes to the app never alter this revision
+def create_partition_sql(table: str, day) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table}_p{day:%Y%m%d} "
+        f"PARTITION OF {table} "
+        f"FOR VALUES FROM ('{day.isoformat()} 00:00:00+00') "
+        f"TO ('{(day + timedelta(days=1)).isoformat()} 00:00:00+00')"
+    )
+
+
+def create_default_partition_sql(table: str) -> str:
+    return f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"
+
+
+def _days_ahead() -> int:
+    # same sizing as maintain_partitions: every token lifetime must fit
+    return max(
+        settings.sweeper.partition_days_ahead, settings.jwt.refresh_expire_day + 1
+    )
+
+
+def upgrade() -> None:
+    # DETACH PARTITION ... CONCURRENTLY is refused while a default partition
+    # exists. Rows that landed in it are moved into daily partitions, and
+    # every day a new token can expire on gets its partition, since inserts
+    # past the last one now fail instead of landing in the default.
+    today = datetime.now(timezone.utc).date()
+    for table in PARTITIONED_TABLES:
+        for offset in range(_days_ahead() + 1):
+            op.execute(create_partition_sql(table, today + timedelta(days=offset)))
+
+        op.execute(f"ALTER TABLE {table} DETACH PARTITION {table}_default")
+        days = (
+            op.get_bind()
+            .execute(
+                sa.text(
+                    "SELECT DISTINCT (expires_at AT TIME ZONE 'UTC')::date "
+                    f"FROM {table}_default"
+                )
+            )
+            .scalars()
+        )
+        for day in days:
+            op.execute(create_partition_sql(table, day))
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_default")
+        op.execute(f"DROP TABLE {table}_default")
+
+
+def downgrade() -> None:
+    for table in PARTITIONED_TABLES:
+        op.execute(create_default_partition_sql(table))
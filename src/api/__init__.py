@@ -1,5 +1,8 @@
 from fastapi import APIRouter
 from api.auth import router as auth_router
+from api.metrics import router as metrics_router
+from api.jwks import router as well_known_router
 
 api_router = APIRouter(prefix="/api/v1")
 api_router.include_router(auth_router)
+api_router.include_router(metrics_router)
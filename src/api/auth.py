@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, Body, status
 from services.user_service import get_user_service, UserService
+from services.reset_requests import reset_request_issuer
 from services.auth_service import (
     authenticate_user_dependency,
     get_auth_service,
@@ -14,7 +15,9 @@ from schemas.auth_schemas import (
     ResetPasswordConfirmSchema,
     ChangePasswordSchema,
 )
+from dto.auth_dto import TokenPrincipal
 from core.security.authentication import (
+    get_current_principal,
     get_current_auth_user,
     get_current_auth_user_for_refresh,
     get_current_token_payload,
@@ -46,10 +49,10 @@ async def login(
 @router.post("/logout", status_code=status.HTTP_200_OK)
 async def logout(
     refresh_token: Annotated[str, Body()],
-    user: Annotated["User", Depends(get_current_auth_user)],
+    principal: Annotated[TokenPrincipal, Depends(get_current_principal)],
     auth_service: Annotated["AuthService", Depends(get_auth_service)],
 ) -> dict:
-    await auth_service.logout_user(user_id=user.id, refresh_token=refresh_token)
+    await auth_service.logout_user(principal=principal, refresh_token=refresh_token)
 
     return {"detail": "Successfully logged out"}
 
@@ -70,11 +73,14 @@ async def refresh(
 
 
 @router.post("/reset-password/request", status_code=status.HTTP_202_ACCEPTED)
-async def request_reset_password(
-    data: ResetPasswordRequestSchema,
-    auth_service: Annotated["AuthService", Depends(get_auth_service)],
-) -> None:
-    await auth_service.create_reset_token(data.email)
+async def request_reset_password(data: ResetPasswordRequestSchema) -> None:
+    """
+    Always 202, whether or not the email belongs to a user. The token is
+    issued in the background; a request accepted while the queue is full or
+    still queued at shutdown is lost (see ``reset_requests`` on /metrics)
+    and has to be repeated.
+    """
+    reset_request_issuer.submit(data.email)
     return
 
 
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from core import settings
+from core.security.keys import key_ring
+
+router = APIRouter(
+    prefix="/.well-known",
+    tags=["JWKS"],
+)
+
+
+@router.get("/jwks.json", status_code=status.HTTP_200_OK)
+async def jwks(request: Request) -> Response:
+    headers = {
+        "Cache-Control": f"public, max-age={settings.jwt.jwks_max_age_seconds}",
+        "ETag": key_ring.jwks_etag,
+    }
+    if request.headers.get("if-none-match") == key_ring.jwks_etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return ORJSONResponse(content=key_ring.jwks, headers=headers)
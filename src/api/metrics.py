@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, status
+from core.security.authentication import check_user_is_admin
+from infrastructure import db_helper, publisher, smtp_pool
+from infrastructure.cache import user_cache, revocation_list
+from core.security.hashing import hashing_pool
+from core.load_shedding import load_shedder
+from core.security.token_cache import verified_token_cache
+from services.token_sweeper import token_sweeper
+from services.outbox_relay import outbox_relay
+from services.login_throttle import login_throttle
+from services.reset_requests import reset_request_issuer
+from infrastructure.broker.routers.mailing_consumer import password_reset_metrics
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+    dependencies=[Depends(check_user_is_admin)],
+)
+
+
+@router.get("", status_code=status.HTTP_200_OK)
+async def metrics() -> dict:
+    return {
+        "db_pool": db_helper.pool_status(),
+        "user_cache": user_cache.stats,
+        "verified_token_cache": verified_token_cache.stats,
+        "revocation_list": revocation_list.stats,
+        "hashing_pool": {
+            "in_flight": hashing_pool.in_flight,
+            "capacity": hashing_pool.capacity,
+        },
+        "token_sweeper": token_sweeper.stats,
+        "broker_publisher": publisher.stats,
+        "outbox_relay": outbox_relay.stats,
+        "reset_requests": reset_request_issuer.stats,
+        "smtp_pool": smtp_pool.stats,
+        "mailing_consumer": password_reset_metrics.to_dict(),
+        "login_throttle": login_throttle.stats,
+        "load_shedding": load_shedder.stats,
+    }
@@ -10,8 +10,47 @@ LOG_DEFAULT_FORMAT = (
 )
 
 
+class RouteLimitConfig(BaseModel):
+    priority: Literal["low", "normal", "critical"] = "normal"
+    # None: no per-route cap, only the global shedding thresholds apply
+    max_concurrency: int | None = None
+    max_queue: int = 0
+    queue_timeout_seconds: float = 0.5
+
+
+class SheddingConfig(BaseModel):
+    """
+    Per-route concurrency caps and priority-based load shedding. Routes are
+    matched by longest path prefix.
+    """
+
+    enabled: bool = True
+    max_in_flight: int = 512
+    # share of max_in_flight above which a priority class is shed
+    shed_thresholds: dict[str, float] = {"low": 0.5, "normal": 0.8, "critical": 1.0}
+    retry_after_seconds: int = 1
+    routes: dict[str, RouteLimitConfig] = {
+        "/api/v1/auth/login": RouteLimitConfig(
+            priority="low", max_concurrency=32, max_queue=64
+        ),
+        "/api/v1/auth/register": RouteLimitConfig(
+            priority="low", max_concurrency=16, max_queue=32
+        ),
+        "/api/v1/auth/reset-password": RouteLimitConfig(
+            priority="low", max_concurrency=16, max_queue=32
+        ),
+        "/api/v1/auth/change_password": RouteLimitConfig(
+            priority="low", max_concurrency=16, max_queue=32
+        ),
+        "/api/v1/auth/refresh": RouteLimitConfig(priority="critical"),
+        "/api/v1/metrics": RouteLimitConfig(priority="critical"),
+        "/.well-known": RouteLimitConfig(priority="critical"),
+    }
+
+
 class MiddlewareConfig(BaseModel):
     cors_allowed_origins: list[str] = '["http://localhost", "http://localhost:5173"]'
+    shedding: SheddingConfig = SheddingConfig()
 
 
 class DBConfig(BaseModel):
@@ -30,6 +69,15 @@ class DBConfig(BaseModel):
     postgres_db: str
     echo: bool = False
 
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    # asyncpg prepared statement cache, set to 0 behind pgbouncer
+    prepared_statement_cache_size: int = 100
+    statement_timeout_ms: int | None = None
+
     @property
     def dsn(self) -> str:
         return (
@@ -45,6 +93,108 @@ class AuthConfig(BaseModel):
     algorithm: str = "HS256"
     reset_token_expire_minute: int
     verify_token_expire_minute: int
+    # repeated reset requests for a user inside this window are no-ops
+    reset_request_coalesce_seconds: int = 60
+    reset_request_coalesce_max_entries: int = 100_000
+    # reset requests are issued off the request path by this many tasks,
+    # each holding at most one DB connection, per worker process
+    reset_request_workers: int = 2
+    reset_request_max_pending: int = 1_000
+    # RS256/ES256: active private key plus public keys of rotated-out keys
+    private_key_path: Path | None = None
+    previous_public_key_paths: list[Path] = []
+    jwks_max_age_seconds: int = 3600
+    # key for reset/verification token digests, derived from secret_key if unset
+    token_hmac_key: str | None = None
+    # verified access-token payloads, keyed by a digest of the raw token
+    token_cache_enabled: bool = True
+    token_cache_max_entries: int = 50_000
+    token_cache_max_bytes: int = 32 * 1024 * 1024
+
+
+class HashingConfig(BaseModel):
+    """
+    Password hashing: scheme, cost and the worker pool that keeps it off the
+    event loop
+    """
+
+    executor: Literal["thread", "process"] = "thread"
+    max_workers: int = 4
+    max_queue_size: int = 32
+    retry_after_seconds: int = 1
+    # new hashes use ``scheme``; older ones are upgraded on login.
+    # ``python -m core.security.calibrate`` picks costs for the hardware
+    scheme: Literal["argon2id", "bcrypt"] = "argon2id"
+    bcrypt_rounds: int = 12
+    argon2_time_cost: int = 3
+    argon2_memory_cost_kib: int = 65536
+    argon2_parallelism: int = 1
+
+
+class CacheConfig(BaseModel):
+    user_cache_enabled: bool = True
+    user_cache_max_size: int = 10_000
+    user_cache_ttl_seconds: float = 60.0
+
+
+class RevocationConfig(BaseModel):
+    """
+    Per-worker Bloom filter over revoked access-token jtis
+    """
+
+    expected_items: int = 100_000
+    false_positive_rate: float = 0.001
+    rebuild_interval_seconds: float = 300.0
+
+
+class ThrottleConfig(BaseModel):
+    """
+    Failed-login limits over a sliding window
+    """
+
+    enabled: bool = True
+    window_seconds: float = 900.0
+    max_failures_per_ip: int = 100
+    max_failures_per_email: int = 10
+    max_failures_per_pair: int = 5
+    max_keys: int = 100_000
+    # proxies in front of the app that each append to X-Forwarded-For; the
+    # client IP is the entry the outermost of them added. 0 ignores the header
+    trusted_proxy_hops: int = 0
+
+
+class SweeperConfig(BaseModel):
+    """
+    Background deletion of expired refresh, reset and verification tokens
+    """
+
+    enabled: bool = True
+    interval_seconds: float = 300.0
+    jitter_seconds: float = 30.0
+    batch_size: int = 1000
+    batch_pause_seconds: float = 0.05
+    # token tables are range-partitioned by day on expires_at
+    manage_partitions: bool = True
+    partition_days_ahead: int = 14
+
+
+class OutboxConfig(BaseModel):
+    """
+    Relay of outbox_messages rows to RabbitMQ
+    """
+
+    enabled: bool = True
+    relays: int = 2
+    batch_size: int = 100
+    poll_interval_seconds: float = 0.5
+    retry_base_seconds: float = 1.0
+    retry_max_seconds: float = 300.0
+    # rows still unpublished after this many attempts are dropped
+    max_attempts: int = 10
+    # how often the relay refreshes the backlog figures shown on /metrics
+    backlog_refresh_seconds: float = 15.0
+    # Fernet key for row payloads, derived from jwt.secret_key if unset
+    payload_key: str | None = None
 
 
 class EmailConfig(BaseModel):
@@ -58,6 +208,15 @@ class EmailConfig(BaseModel):
     username: str | None = None
     password: str | None = None
     use_tls: bool = True
+    # persistent SMTP connections shared by the mailing consumer
+    pool_size: int = 4
+    keepalive_interval_seconds: float = 30.0
+    timeout_seconds: float = 30.0
+    # mailing consumer: prefetch, parallel sends and TTL retry queues
+    consumer_prefetch: int = 64
+    consumer_concurrency: int = 16
+    retry_base_delay_seconds: float = 10.0
+    max_retries: int = 5
 
 
 class BrokerConfig(BaseModel):
@@ -68,6 +227,8 @@ class BrokerConfig(BaseModel):
     rabbitmq_port: int = 5672
     enable_broker: bool = True
     with_real: bool = False
+    # how long the outbox relay waits for publisher confirms of a batch
+    publisher_confirm_timeout_seconds: float = 5.0
 
     @property
     def rabbit_dsn(self) -> str:
@@ -113,6 +274,12 @@ class Settings(BaseSettings):
     jwt: AuthConfig
     mode: str
     mail: EmailConfig = EmailConfig()
+    hashing: HashingConfig = HashingConfig()
+    cache: CacheConfig = CacheConfig()
+    revocation: RevocationConfig = RevocationConfig()
+    throttle: ThrottleConfig = ThrottleConfig()
+    sweeper: SweeperConfig = SweeperConfig()
+    outbox: OutboxConfig = OutboxConfig()
     br: BrokerConfig = BrokerConfig()
     fron: FrontendConfig = FrontendConfig()
     logging: LoggingConfig = LoggingConfig()
@@ -1,7 +1,12 @@
 from fastapi import FastAPI, Request, status
 from fastapi.responses import ORJSONResponse
 from sqlalchemy.exc import DatabaseError
-from core.exceptions import NotFoundError, AlreadyExistsError
+from core.exceptions import (
+    NotFoundError,
+    AlreadyExistsError,
+    ServiceBusyError,
+    TooManyRequestsError,
+)
 
 
 def register_error_handlers(app: FastAPI) -> None:
@@ -24,6 +29,26 @@ def register_error_handlers(app: FastAPI) -> None:
             },
         )
 
+    @app.exception_handler(ServiceBusyError)
+    async def service_busy(request: Request, exc: ServiceBusyError):
+        return ORJSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "detail": str(exc),
+            },
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+    @app.exception_handler(TooManyRequestsError)
+    async def too_many_requests(request: Request, exc: TooManyRequestsError):
+        return ORJSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={
+                "detail": str(exc),
+            },
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
     @app.exception_handler(DatabaseError)
     async def database_error(request: Request, exc: DatabaseError):
         return ORJSONResponse(
@@ -9,6 +9,18 @@ class AlreadyExistsError(Exception):
     pass
 
 
+class ServiceBusyError(Exception):
+    def __init__(self, message: str = "Server is busy", retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TooManyRequestsError(Exception):
+    def __init__(self, message: str = "Too many requests", retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 def unauthorized_exc_incorrect() -> HTTPException:
     return HTTPException(
         status_code=401,
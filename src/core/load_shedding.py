@@ -0,0 +1,166 @@
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from core.config import RouteLimitConfig, SheddingConfig, settings
+from core.exceptions import ServiceBusyError
+import asyncio
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class RouteClass:
+    """
+    Requests sharing a path prefix: priority, optional concurrency cap and
+    the counters exposed on /metrics.
+    """
+
+    def __init__(self, name: str, limit: RouteLimitConfig) -> None:
+        self.name = name
+        self.limit = limit
+        self.semaphore = (
+            asyncio.Semaphore(limit.max_concurrency)
+            if limit.max_concurrency is not None
+            else None
+        )
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.shed = 0
+        self.queue_timeouts = 0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "priority": self.limit.priority,
+            "max_concurrency": self.limit.max_concurrency,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "queue_timeouts": self.queue_timeouts,
+        }
+
+
+class LoadShedder:
+    """
+    Admission control in front of the app.
+
+    A request is shed when the process-wide in-flight count is above its
+    priority's threshold, so low-priority routes go first. Capped routes
+    additionally wait in a bounded queue for a slot and are shed when the
+    queue is full or the wait exceeds their timeout. Waiting requests count
+    as in flight.
+    """
+
+    def __init__(self, config: SheddingConfig) -> None:
+        self._config = config
+        # longest prefix first
+        self._routes = [
+            RouteClass(prefix, limit)
+            for prefix, limit in sorted(
+                config.routes.items(), key=lambda item: -len(item[0])
+            )
+        ]
+        self._default = RouteClass("default", RouteLimitConfig())
+        self.enabled = config.enabled
+        self.in_flight = 0
+
+    def classify(self, path: str) -> RouteClass:
+        for route in self._routes:
+            if path.startswith(route.name):
+                return route
+        return self._default
+
+    def _shed(self, route: RouteClass) -> ServiceBusyError:
+        route.shed += 1
+        return ServiceBusyError(retry_after=self._config.retry_after_seconds)
+
+    async def _wait_for_slot(self, route: RouteClass) -> None:
+        if route.semaphore is None:
+            return
+        if not route.semaphore.locked():
+            await route.semaphore.acquire()
+            return
+        if route.queued >= route.limit.max_queue:
+            raise self._shed(route)
+
+        route.queued += 1
+        try:
+            # unlike wait_for before 3.12, never drops a permit acquired just
+            # as the timeout fires
+            async with asyncio.timeout(route.limit.queue_timeout_seconds):
+                await route.semaphore.acquire()
+        except TimeoutError:
+            route.queue_timeouts += 1
+            raise self._shed(route)
+        finally:
+            route.queued -= 1
+
+    async def acquire(self, path: str) -> RouteClass:
+        route = self.classify(path)
+        threshold = self._config.shed_thresholds.get(route.limit.priority, 1.0)
+        if self.in_flight >= self._config.max_in_flight * threshold:
+            raise self._shed(route)
+
+        self.in_flight += 1
+        try:
+            await self._wait_for_slot(route)
+        except BaseException:
+            self.in_flight -= 1
+            raise
+        route.in_flight += 1
+        route.admitted += 1
+        return route
+
+    def release(self, route: RouteClass) -> None:
+        self.in_flight -= 1
+        route.in_flight -= 1
+        if route.semaphore is not None:
+            route.semaphore.release()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self._config.max_in_flight,
+            "routes": {
+                route.name: route.stats for route in (*self._routes, self._default)
+            },
+        }
+
+
+load_shedder = LoadShedder(settings.midd.shedding)
+
+
+class LoadSheddingMiddleware:
+    """
+    Pure ASGI middleware, so shed requests are answered before routing,
+    dependency resolution or body parsing.
+    """
+
+    def __init__(self, app: ASGIApp, shedder: LoadShedder = load_shedder) -> None:
+        self.app = app
+        self.shedder = shedder
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.shedder.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            route = await self.shedder.acquire(scope["path"])
+        except ServiceBusyError as exc:
+            log.warning("Shedding %s %s", scope["method"], scope["path"])
+            response = ORJSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": str(exc)},
+                headers={"Retry-After": str(exc.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.shedder.release(route)
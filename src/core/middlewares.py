@@ -1,10 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from core import settings
+from core.load_shedding import LoadSheddingMiddleware, load_shedder
 
 
 def register_middleware(app: FastAPI) -> None:
 
+    # added first so it sits innermost: CORS headers are still set on a 503
+    app.add_middleware(LoadSheddingMiddleware, shedder=load_shedder)
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.midd.cors_allowed_origins,
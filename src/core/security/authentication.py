@@ -1,8 +1,13 @@
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from services.user_service import get_user_service, UserService
+from infrastructure import UnitOfWork, get_unit_of_work
 from typing import Annotated, TYPE_CHECKING
 from fastapi import HTTPException, Depends
 from core import Security, exceptions
+from core.security.token_cache import verified_token_cache
+from infrastructure.cache import revocation_list
+from dto.auth_dto import TokenPrincipal
+from schemas.base_schemas import UserRole
 from jose import JWTError
 
 if TYPE_CHECKING:
@@ -19,10 +24,15 @@ def get_current_token_payload(
 
     token = credentials.credentials
 
+    if (payload := verified_token_cache.get(token)) is not None:
+        return payload
+
     try:
         payload = Security.decode_token(token=token)
-    except JWTError:
+    except (JWTError, ValueError):
         raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    verified_token_cache.set(token, payload)
     return payload
 
 
@@ -36,6 +46,20 @@ def validate_token(payload: dict, token_type: str) -> bool:
     return True
 
 
+async def ensure_token_not_revoked(payload: dict, token_type: str) -> None:
+    # refresh tokens are checked against their own table on use
+    if token_type != "access":
+        return
+    if await revocation_list.is_revoked(str(payload.get("jti"))):
+        raise exceptions.unauthorized_exc_inactive_token()
+
+
+def ensure_token_version(payload: dict, current_version: int | None) -> None:
+    # a bumped users.token_version logs out every token issued before it
+    if current_version is None or payload.get("ver", 0) != current_version:
+        raise exceptions.unauthorized_exc_inactive_token()
+
+
 async def get_user_by_token_sub(
     payload: dict,
     user_service: "UserService",
@@ -49,24 +73,61 @@ async def get_user_by_token_sub(
 def get_auth_user_from_token_of_type(token_type: str):
     async def get_auth_user_from_token(
         user_service: Annotated["UserService", Depends(get_user_service)],
+        uow: Annotated[UnitOfWork, Depends(get_unit_of_work)],
         payload: Annotated[dict, Depends(get_current_token_payload)],
     ) -> "User":
         validate_token(payload=payload, token_type=token_type)
-        return await get_user_by_token_sub(
+        await ensure_token_not_revoked(payload=payload, token_type=token_type)
+        user = await get_user_by_token_sub(
             payload=payload,
             user_service=user_service,
         )
+        ensure_token_version(payload=payload, current_version=user.token_version)
+        # the handler may hash a password next, don't hold the connection for it
+        await uow.commit()
+        return user
 
     return get_auth_user_from_token
 
 
+def get_principal_from_token_of_type(token_type: str):
+    async def get_principal_from_token(
+        user_service: Annotated["UserService", Depends(get_user_service)],
+        payload: Annotated[dict, Depends(get_current_token_payload)],
+    ) -> TokenPrincipal:
+        validate_token(payload=payload, token_type=token_type)
+        try:
+            principal = TokenPrincipal.from_payload(payload)
+        except (KeyError, ValueError):
+            raise exceptions.unauthorized_exc_inactive_token()
+        await ensure_token_not_revoked(payload=payload, token_type=token_type)
+        ensure_token_version(
+            payload=payload,
+            current_version=await user_service.get_token_version(principal.id),
+        )
+        return principal
+
+    return get_principal_from_token
+
+
 get_current_auth_user = get_auth_user_from_token_of_type("access")
 get_current_auth_user_for_refresh = get_auth_user_from_token_of_type("refresh")
+get_current_principal = get_principal_from_token_of_type("access")
 
 
 def check_user_is_active(
-    user: Annotated["User", Depends(get_current_auth_user)],
+    principal: Annotated[TokenPrincipal, Depends(get_current_principal)],
 ) -> bool:
-    if not user.is_active:
+    if not principal.is_active:
         raise exceptions.forbidden_exc_inactive()
     return True
+
+
+def check_user_is_admin(
+    principal: Annotated[TokenPrincipal, Depends(get_current_principal)],
+) -> TokenPrincipal:
+    if not principal.is_active:
+        raise exceptions.forbidden_exc_inactive()
+    if principal.role != UserRole.admin:
+        raise exceptions.forbidden_exc_not_enough_rights()
+    return principal
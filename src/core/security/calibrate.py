@@ -0,0 +1,99 @@
+"""
+Pick password-hashing costs that hit a target latency on this machine.
+
+    python -m core.security.calibrate --target-ms 250
+"""
+
+from core.security.password_hashers import (
+    Argon2idHasher,
+    BcryptHasher,
+    PasswordHasher,
+)
+from core.config import settings
+import argparse
+import statistics
+import time
+
+SAMPLE_PASSWORD = "calibration-Password-1"
+
+
+def measure_ms(hasher: PasswordHasher, samples: int = 3) -> float:
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash(SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt(target_ms: float, max_rounds: int = 16) -> tuple[int, float]:
+    """
+    Highest bcrypt rounds whose hash stays within ``target_ms``, never
+    below 10.
+    """
+    rounds, elapsed = 10, measure_ms(BcryptHasher(rounds=10))
+    while rounds < max_rounds:
+        # every extra round doubles the work
+        if elapsed * 2 > target_ms:
+            break
+        rounds += 1
+        elapsed = measure_ms(BcryptHasher(rounds=rounds))
+    return rounds, elapsed
+
+
+def calibrate_argon2id(
+    target_ms: float,
+    memory_cost: int,
+    parallelism: int,
+    max_time_cost: int = 20,
+) -> tuple[int, float]:
+    """
+    Highest argon2id time cost within ``target_ms`` for a fixed memory cost.
+    """
+    time_cost = 1
+    elapsed = measure_ms(Argon2idHasher(1, memory_cost, parallelism))
+    while time_cost < max_time_cost:
+        candidate = measure_ms(Argon2idHasher(time_cost + 1, memory_cost, parallelism))
+        if candidate > target_ms:
+            break
+        time_cost, elapsed = time_cost + 1, candidate
+    return time_cost, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Password hashing cost calibration")
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument(
+        "--scheme",
+        choices=("argon2id", "bcrypt"),
+        default=settings.hashing.scheme,
+    )
+    parser.add_argument(
+        "--memory-kib",
+        type=int,
+        default=settings.hashing.argon2_memory_cost_kib,
+        help="argon2id memory cost, fixed while the time cost is searched",
+    )
+    parser.add_argument(
+        "--parallelism", type=int, default=settings.hashing.argon2_parallelism
+    )
+    args = parser.parse_args()
+
+    if args.scheme == "bcrypt":
+        rounds, elapsed = calibrate_bcrypt(args.target_ms)
+        print(f"# bcrypt: {elapsed:.1f} ms per hash")
+        print("APP_CONFIG__HASHING__SCHEME=bcrypt")
+        print(f"APP_CONFIG__HASHING__BCRYPT_ROUNDS={rounds}")
+    else:
+        time_cost, elapsed = calibrate_argon2id(
+            args.target_ms, args.memory_kib, args.parallelism
+        )
+        print(f"# argon2id: {elapsed:.1f} ms per hash")
+        print("APP_CONFIG__HASHING__SCHEME=argon2id")
+        print(f"APP_CONFIG__HASHING__ARGON2_TIME_COST={time_cost}")
+        print(f"APP_CONFIG__HASHING__ARGON2_MEMORY_COST_KIB={args.memory_kib}")
+        print(f"APP_CONFIG__HASHING__ARGON2_PARALLELISM={args.parallelism}")
+
+
+if __name__ == "__main__":
+    main()
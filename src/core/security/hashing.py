@@ -0,0 +1,78 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Literal, TypeVar
+from core.exceptions import ServiceBusyError
+from core.config import settings
+import asyncio
+import logging
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HashingPool:
+    """
+    Bounded executor for CPU-heavy password hashing.
+
+    At most ``max_workers + max_queue_size`` calls may be in flight; anything
+    above that is rejected immediately with ``ServiceBusyError``.
+    """
+
+    def __init__(
+        self,
+        *,
+        executor: Literal["thread", "process"],
+        max_workers: int,
+        max_queue_size: int,
+        retry_after: int = 1,
+    ) -> None:
+        self._executor_type = executor
+        self._max_workers = max_workers
+        self._capacity = max_workers + max_queue_size
+        self._retry_after = retry_after
+        self._executor: Executor | None = None
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="hashing",
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        if self._in_flight >= self._capacity:
+            log.warning("Hashing pool saturated (%s in flight)", self._in_flight)
+            raise ServiceBusyError(retry_after=self._retry_after)
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._in_flight -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(
+    executor=settings.hashing.executor,
+    max_workers=settings.hashing.max_workers,
+    max_queue_size=settings.hashing.max_queue_size,
+    retry_after=settings.hashing.retry_after_seconds,
+)
@@ -0,0 +1,92 @@
+from jose import jwk
+from jose.backends.base import Key
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError, JWTError
+from jose.utils import base64url_decode, base64url_encode
+from core.security.keys import KeyRing, key_ring
+import orjson
+import time
+
+
+class JWTCodec:
+    """
+    Long-lived JWS compact signer/verifier.
+
+    Keys are parsed into jose ``Key`` objects and the protected header is
+    serialized once, so signing and verifying only do base64, orjson and
+    the signature primitive itself instead of re-parsing the key on every
+    call like ``jose.jwt.encode``/``decode``.
+    """
+
+    def __init__(self, ring: KeyRing, leeway: int = 0) -> None:
+        self._algorithm = ring.algorithm
+        self._active_kid = ring.active_kid
+        self._leeway = leeway
+        self._signing_key: Key = jwk.construct(ring.signing_key, ring.algorithm)
+        self._verification_keys: dict[str, Key] = {
+            kid: jwk.construct(pem, ring.algorithm)
+            for kid, pem in ring.verification_keys.items()
+        }
+
+        header = {"alg": ring.algorithm, "typ": "JWT"}
+        if ring.headers:
+            header.update(ring.headers)
+        self._encoded_header = base64url_encode(orjson.dumps(header))
+
+    def encode(self, claims: dict) -> str:
+        signing_input = b".".join(
+            (self._encoded_header, base64url_encode(orjson.dumps(claims)))
+        )
+        signature = base64url_encode(self._signing_key.sign(signing_input))
+        return b".".join((signing_input, signature)).decode()
+
+    def _key_for(self, header: dict) -> Key:
+        if header.get("alg") != self._algorithm:
+            raise JWTError("The specified alg value is not allowed")
+        if self._active_kid is None:
+            return self._signing_key
+        kid = header.get("kid") or self._active_kid
+        if not isinstance(kid, str):
+            raise JWTError("Unknown signing key")
+        try:
+            return self._verification_keys[kid]
+        except KeyError:
+            raise JWTError("Unknown signing key")
+
+    def decode(self, token: str) -> dict:
+        try:
+            signing_input, encoded_signature = token.encode().rsplit(b".", 1)
+            encoded_header, encoded_claims = signing_input.split(b".", 1)
+            header = orjson.loads(base64url_decode(encoded_header))
+            signature = base64url_decode(encoded_signature)
+        except (ValueError, TypeError, orjson.JSONDecodeError):
+            raise JWTError("Malformed token")
+        if not isinstance(header, dict):
+            raise JWTError("Malformed token")
+
+        if not self._key_for(header).verify(signing_input, signature):
+            raise JWTError("Signature verification failed")
+
+        try:
+            claims = orjson.loads(base64url_decode(encoded_claims))
+        except (ValueError, orjson.JSONDecodeError):
+            raise JWTError("Invalid payload")
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload")
+
+        self._validate_claims(claims)
+        return claims
+
+    def _validate_claims(self, claims: dict) -> None:
+        now = time.time()
+        exp = claims.get("exp")
+        if not isinstance(exp, int):
+            raise JWTClaimsError("Expiration Time claim (exp) must be an integer")
+        if exp <= now - self._leeway:
+            raise ExpiredSignatureError("Signature has expired")
+
+        nbf = claims.get("nbf")
+        if nbf is not None and nbf > now + self._leeway:
+            raise JWTClaimsError("The token is not yet valid (nbf)")
+
+
+jwt_codec = JWTCodec(key_ring)
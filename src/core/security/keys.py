@@ -0,0 +1,101 @@
+from cryptography.hazmat.primitives import serialization
+from jose import jwk
+from pathlib import Path
+from core.config import settings
+import base64
+import hashlib
+import json
+
+# members used for the RFC 7638 thumbprint, per key type
+THUMBPRINT_MEMBERS = {
+    "RSA": ("e", "kty", "n"),
+    "EC": ("crv", "kty", "x", "y"),
+}
+
+
+def _public_jwk(public_pem: bytes, algorithm: str) -> dict:
+    public = jwk.construct(public_pem, algorithm).to_dict()
+    members = {name: public[name] for name in THUMBPRINT_MEMBERS[public["kty"]]}
+    digest = hashlib.sha256(
+        json.dumps(members, separators=(",", ":"), sort_keys=True).encode()
+    ).digest()
+    kid = base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+    return {**public, "kid": kid, "use": "sig"}
+
+
+class KeyRing:
+    """
+    Signing key plus every key tokens may still be verified with.
+
+    HS* algorithms use the shared secret and publish no JWKS. Asymmetric
+    algorithms (RS*, ES*) sign with the active private key and verify with
+    it or any previous public key, looked up by ``kid``.
+    """
+
+    def __init__(
+        self,
+        *,
+        algorithm: str,
+        secret_key: str,
+        private_key_pem: bytes | None = None,
+        previous_public_key_pems: tuple[bytes, ...] = (),
+    ) -> None:
+        self.algorithm = algorithm
+        self.jwks: dict = {"keys": []}
+
+        if algorithm.startswith("HS"):
+            self.active_kid: str | None = None
+            self.signing_key: str = secret_key
+            self.verification_keys: dict[str, str] = {}
+        else:
+            if private_key_pem is None:
+                raise ValueError(f"{algorithm} requires jwt.private_key_path")
+
+            private_key = serialization.load_pem_private_key(
+                private_key_pem, password=None
+            )
+            public_key_pem = private_key.public_key().public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+
+            self.signing_key = private_key_pem.decode()
+            self.verification_keys = {}
+            for pem in (public_key_pem, *previous_public_key_pems):
+                public = _public_jwk(pem, algorithm)
+                self.verification_keys[public["kid"]] = pem.decode()
+                self.jwks["keys"].append(public)
+            self.active_kid = self.jwks["keys"][0]["kid"]
+
+        self.jwks_etag = '"{}"'.format(
+            hashlib.sha256(json.dumps(self.jwks, sort_keys=True).encode()).hexdigest()
+        )
+
+    @property
+    def headers(self) -> dict | None:
+        return {"kid": self.active_kid} if self.active_kid else None
+
+    def verification_key(self, kid: str | None) -> str:
+        if self.active_kid is None:
+            return self.signing_key
+        try:
+            return self.verification_keys[kid or self.active_kid]
+        except KeyError:
+            raise ValueError(f"Unknown signing key {kid!r}")
+
+    @classmethod
+    def from_settings(cls) -> "KeyRing":
+        def read(path: Path | None) -> bytes | None:
+            return path.read_bytes() if path else None
+
+        return cls(
+            algorithm=settings.jwt.algorithm,
+            secret_key=settings.jwt.secret_key,
+            private_key_pem=read(settings.jwt.private_key_path),
+            previous_public_key_pems=tuple(
+                read(path) for path in settings.jwt.previous_public_key_paths
+            ),
+        )
+
+
+key_ring = KeyRing.from_settings()
@@ -0,0 +1,124 @@
+from abc import ABC, abstractmethod
+from typing import Sequence
+from argon2 import PasswordHasher as Argon2PasswordHasher, Type
+from argon2.exceptions import InvalidHashError, VerificationError
+from core.config import settings
+import bcrypt
+
+
+class PasswordHasher(ABC):
+    scheme: str
+
+    @abstractmethod
+    def identify(self, hashed_password: str) -> bool: ...
+
+    @abstractmethod
+    def hash(self, password: str) -> str: ...
+
+    @abstractmethod
+    def verify(self, password: str, hashed_password: str) -> bool: ...
+
+    @abstractmethod
+    def needs_rehash(self, hashed_password: str) -> bool: ...
+
+
+class BcryptHasher(PasswordHasher):
+    scheme = "bcrypt"
+
+    def __init__(self, rounds: int = 12) -> None:
+        self.rounds = rounds
+
+    def identify(self, hashed_password: str) -> bool:
+        return hashed_password.startswith(("$2a$", "$2b$", "$2y$"))
+
+    def hash(self, password: str) -> str:
+        return bcrypt.hashpw(
+            password.encode("utf-8"),
+            bcrypt.gensalt(rounds=self.rounds),
+        ).decode("utf-8")
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return bcrypt.checkpw(
+            password.encode("utf-8"),
+            hashed_password.encode("utf-8"),
+        )
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        # $2b$<rounds>$<salt+hash>
+        return int(hashed_password.split("$")[2]) != self.rounds
+
+
+class Argon2idHasher(PasswordHasher):
+    scheme = "argon2id"
+
+    def __init__(
+        self, time_cost: int = 3, memory_cost: int = 65536, parallelism: int = 1
+    ) -> None:
+        self._hasher = Argon2PasswordHasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+            type=Type.ID,
+        )
+
+    def identify(self, hashed_password: str) -> bool:
+        return hashed_password.startswith("$argon2id$")
+
+    def hash(self, password: str) -> str:
+        return self._hasher.hash(password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        try:
+            return self._hasher.verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return self._hasher.check_needs_rehash(hashed_password)
+
+
+class PasswordHasherRegistry:
+    """
+    Hashes new passwords with the default scheme and verifies any registered
+    scheme, recognised by the stored hash prefix. A hash needs rehashing if
+    it uses another scheme or stale cost parameters.
+    """
+
+    def __init__(self, default: str, hashers: Sequence[PasswordHasher]) -> None:
+        self._hashers = {hasher.scheme: hasher for hasher in hashers}
+        self.default = self._hashers[default]
+
+    def identify(self, hashed_password: str) -> PasswordHasher | None:
+        for hasher in self._hashers.values():
+            if hasher.identify(hashed_password):
+                return hasher
+        return None
+
+    def hash(self, password: str) -> str:
+        return self.default.hash(password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        if (hasher := self.identify(hashed_password)) is None:
+            return False
+        return hasher.verify(password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        hasher = self.identify(hashed_password)
+        return hasher is not self.default or hasher.needs_rehash(hashed_password)
+
+    @classmethod
+    def from_settings(cls) -> "PasswordHasherRegistry":
+        return cls(
+            default=settings.hashing.scheme,
+            hashers=[
+                Argon2idHasher(
+                    time_cost=settings.hashing.argon2_time_cost,
+                    memory_cost=settings.hashing.argon2_memory_cost_kib,
+                    parallelism=settings.hashing.argon2_parallelism,
+                ),
+                BcryptHasher(rounds=settings.hashing.bcrypt_rounds),
+            ],
+        )
+
+
+password_hashers = PasswordHasherRegistry.from_settings()
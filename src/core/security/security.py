@@ -1,10 +1,14 @@
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
-from jose import jwt, JWTError
+from jose import JWTError
 from core import settings
+from core.security.hashing import hashing_pool
+from core.security.jwt_codec import jwt_codec
+from core.security.password_hashers import password_hashers
 import secrets
 import hashlib
-import bcrypt
+import hmac
+import time
 import uuid
 
 if TYPE_CHECKING:
@@ -12,31 +16,45 @@ if TYPE_CHECKING:
 
 ACCESS_TOKEN = "access"
 REFRESH_TOKEN = "refresh"
+TOKEN_VERSION_CLAIM = "ver"
+SECONDS_PER_DAY = 24 * 60 * 60
+TOKEN_DIGEST_PREFIX = "hmac-sha256$"
+TOKEN_HMAC_KEY = (
+    settings.jwt.token_hmac_key.encode()
+    if settings.jwt.token_hmac_key
+    else hmac.digest(settings.jwt.secret_key.encode(), b"user-token-digest", "sha256")
+)
 
 
 class Security:
     @staticmethod
     def hash_password(password: str) -> str:
-        return bcrypt.hashpw(
-            password.encode("utf-8"),
-            bcrypt.gensalt(),
-        ).decode("utf-8")
+        return password_hashers.hash(password)
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
-        return bcrypt.checkpw(
-            plain_password.encode("utf-8"),
-            hashed_password.encode("utf-8"),
+        return password_hashers.verify(plain_password, hashed_password)
+
+    @staticmethod
+    def password_needs_rehash(hashed_password: str) -> bool:
+        return password_hashers.needs_rehash(hashed_password)
+
+    @classmethod
+    async def hash_password_async(cls, password: str) -> str:
+        return await hashing_pool.run(cls.hash_password, password)
+
+    @classmethod
+    async def verify_password_async(
+        cls, plain_password: str, hashed_password: str
+    ) -> bool:
+        return await hashing_pool.run(
+            cls.verify_password, plain_password, hashed_password
         )
 
     @staticmethod
     def decode_token(token: str) -> dict:
         try:
-            return jwt.decode(
-                token,
-                settings.jwt.secret_key,
-                algorithms=[settings.jwt.algorithm],
-            )
+            return jwt_codec.decode(token)
         except JWTError:
             raise ValueError("Invalid or expired token")
 
@@ -44,39 +62,39 @@ class Security:
     def _create_token(
         token_type: str,
         payload: dict,
-        secret_key: str = settings.jwt.secret_key,
         expire_days: int = settings.jwt.access_expire_day,
         expire_timedelta: timedelta | None = None,
         jti: str | None = None,
         refresh_exp: datetime | None = None,
     ) -> str:
-        to_encode = payload.copy()
-        now = datetime.now(timezone.utc)
-
-        if expire_timedelta:
-            expire = now + expire_timedelta
-        else:
-            expire = now + timedelta(days=expire_days)
-
-        to_encode.update(type=token_type, exp=expire, iat=now)
-
-        if token_type == ACCESS_TOKEN:
-            to_encode["jti"] = str(uuid.uuid4())
-        elif token_type == REFRESH_TOKEN:
-            to_encode["jti"] = jti or str(uuid.uuid4())
+        now = int(time.time())
 
         if refresh_exp:
-            to_encode["exp"] = refresh_exp
+            expire = int(refresh_exp.timestamp())
+        elif expire_timedelta:
+            expire = now + int(expire_timedelta.total_seconds())
         else:
-            to_encode["exp"] = expire
+            expire = now + expire_days * SECONDS_PER_DAY
 
-        return jwt.encode(to_encode, secret_key, algorithm=settings.jwt.algorithm)
+        payload.update(
+            type=token_type,
+            exp=expire,
+            iat=now,
+            jti=jti or str(uuid.uuid4()),
+        )
+        return jwt_codec.encode(payload)
 
     @classmethod
     def create_access_token(cls, data: "User") -> str:
         return cls._create_token(
             token_type=ACCESS_TOKEN,
-            payload={"sub": str(data.id)},
+            payload={
+                "sub": str(data.id),
+                "role": str(data.role),
+                "is_active": data.is_active,
+                "is_verified": data.is_verified,
+                TOKEN_VERSION_CLAIM: data.token_version,
+            },
             expire_days=settings.jwt.access_expire_day,
         )
 
@@ -84,7 +102,10 @@ class Security:
     def create_refresh_token(cls, data: "User", jti: str, refresh_exp: datetime) -> str:
         return cls._create_token(
             token_type=REFRESH_TOKEN,
-            payload={"sub": str(data.id)},
+            payload={
+                "sub": str(data.id),
+                TOKEN_VERSION_CLAIM: data.token_version,
+            },
             jti=jti,
             refresh_exp=refresh_exp,
         )
@@ -93,6 +114,24 @@ class Security:
     def generate_token() -> str:
         return secrets.token_urlsafe(32)
 
+    generate_reset_token = generate_token
+
     @staticmethod
     def hash_token_sha256(token: str) -> str:
         return hashlib.sha256(token.encode()).hexdigest()
+
+    @staticmethod
+    def hash_token_hmac(token: str) -> str:
+        """
+        Keyed digest for high-entropy reset/verification tokens, where
+        bcrypt's cost buys nothing.
+        """
+        digest = hmac.new(TOKEN_HMAC_KEY, token.encode(), "sha256").hexdigest()
+        return TOKEN_DIGEST_PREFIX + digest
+
+    @classmethod
+    async def verify_token_digest(cls, token: str, stored: str) -> bool:
+        if stored.startswith(TOKEN_DIGEST_PREFIX):
+            return hmac.compare_digest(cls.hash_token_hmac(token), stored)
+        # rows issued before the HMAC scheme hold a bcrypt hash
+        return await cls.verify_password_async(token, stored)
@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from core.config import settings
+import hashlib
+import sys
+import time
+
+
+class VerifiedTokenCache:
+    """
+    LRU of already verified token payloads, keyed by a digest of the raw
+    bearer string and kept until the token's own ``exp``.
+
+    Only signature verification and JSON decoding are skipped; revocation
+    and token-version checks still run on the returned payload.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, enabled: bool = True):
+        self.enabled = enabled
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._data: OrderedDict[bytes, tuple[int, dict, int]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    @staticmethod
+    def _entry_size(key: bytes, payload: dict) -> int:
+        return (
+            sys.getsizeof(key)
+            + sys.getsizeof(payload)
+            + sum(sys.getsizeof(value) for value in payload.values())
+        )
+
+    def get(self, token: str) -> dict | None:
+        if not self.enabled:
+            return None
+
+        key = self._key(token)
+        if (entry := self._data.get(key)) is None:
+            self.misses += 1
+            return None
+
+        exp, payload, _ = entry
+        if exp <= time.time():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def set(self, token: str, payload: dict) -> None:
+        if not self.enabled or not isinstance(payload.get("exp"), int):
+            return
+
+        key = self._key(token)
+        size = self._entry_size(key, payload)
+        if size > self._max_bytes:
+            return
+
+        self._remove(key)
+        self._data[key] = (payload["exp"], payload, size)
+        self._bytes += size
+
+        while len(self._data) > self._max_entries or self._bytes > self._max_bytes:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: bytes) -> None:
+        if (entry := self._data.pop(key, None)) is not None:
+            self._bytes -= entry[2]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._bytes = 0
+
+    @property
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "bytes": self._bytes,
+            "max_entries": self._max_entries,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+verified_token_cache = VerifiedTokenCache(
+    max_entries=settings.jwt.token_cache_max_entries,
+    max_bytes=settings.jwt.token_cache_max_bytes,
+    enabled=settings.jwt.token_cache_enabled,
+)
@@ -2,11 +2,17 @@ from fastapi import FastAPI
 from fastapi.responses import ORJSONResponse
 from typing import AsyncGenerator
 from contextlib import asynccontextmanager
-from infrastructure import db_helper, broker
+from infrastructure import db_helper, broker, smtp_pool
+from infrastructure.cache import revocation_list
 from core.middlewares import register_middleware
 from core.error_handlers import register_error_handlers
-from api import api_router
+from api import api_router, well_known_router
 from core import settings
+from core.security.hashing import hashing_pool
+from services.token_sweeper import token_sweeper
+from services.outbox_relay import outbox_relay
+from services.reset_requests import reset_request_issuer
+from infrastructure.broker.routers.mailing_consumer import declare_mailing_queues
 from views import view_router
 import logging
 
@@ -19,14 +25,30 @@ logging.basicConfig(
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     if settings.br.enable_broker:
+        smtp_pool.start()
         await broker.start()
+        await declare_mailing_queues(broker)
+        if settings.outbox.enabled:
+            outbox_relay.start()
+
+    await revocation_list.start()
+    reset_request_issuer.start()
+
+    if settings.sweeper.enabled:
+        token_sweeper.start()
 
     yield
 
+    await reset_request_issuer.stop()
+    await outbox_relay.stop()
+    await token_sweeper.stop()
+    await revocation_list.stop()
     await db_helper.dispose()
+    hashing_pool.shutdown()
 
     if settings.br.enable_broker:
         await broker.stop()
+        await smtp_pool.close()
 
 
 def create_app() -> FastAPI:
@@ -40,5 +62,6 @@ def create_app() -> FastAPI:
     register_error_handlers(app)
 
     app.include_router(api_router)
+    app.include_router(well_known_router)
     app.include_router(view_router)
     return app
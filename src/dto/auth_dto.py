@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from schemas.base_schemas import TokenTypeEnum
+from schemas.base_schemas import TokenTypeEnum, UserRole
 
 
 @dataclass(slots=True)
@@ -22,8 +22,41 @@ class CreateRefreshTokenDTO(CreateTokenDTO):
     jti: str
 
 
+@dataclass(slots=True)
+class CreateRevokedTokenDTO(CreateTokenDTO):
+    jti: str
+
+
 @dataclass(slots=True)
 class CreateUserTokenDTO(CreateTokenDTO):
     lookup_hash: str
     hashed_token: str
     token_type: TokenTypeEnum
+
+
+@dataclass(slots=True, frozen=True)
+class TokenPrincipal:
+    """
+    Authenticated caller built from access-token claims, without a DB lookup.
+    """
+
+    id: int
+    role: UserRole
+    is_active: bool
+    is_verified: bool
+    jti: str
+    exp: int
+    token_version: int
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "TokenPrincipal":
+        return cls(
+            id=int(payload["sub"]),
+            role=UserRole(payload["role"]),
+            is_active=bool(payload["is_active"]),
+            is_verified=bool(payload["is_verified"]),
+            jti=payload["jti"],
+            exp=int(payload["exp"]),
+            # tokens issued before the claim existed count as version 0
+            token_version=int(payload.get("ver", 0)),
+        )
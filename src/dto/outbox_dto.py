@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class CreateOutboxMessageDTO:
+    payload: dict
+    queue: str = ""
+    exchange: str | None = None
@@ -1,31 +1,46 @@
 __all__ = [
     "db_helper",
+    "UnitOfWork",
+    "get_unit_of_work",
     "Base",
     "User",
     "RefreshToken",
+    "UserToken",
+    "RevokedToken",
+    "OutboxMessage",
     "UserRepository",
-    "TokenRepository",
-    "PasswordResetToken",
-    "PasswordResetTokenRepository",
+    "RefreshTokenRepository",
+    "UserTokenRepository",
+    "RevokedTokenRepository",
+    "OutboxRepository",
     "EmailManager",
     "get_email_manager",
+    "smtp_pool",
     "broker",
+    "publisher",
+    "publish_auth_event",
 ]
 
 # DB
 from infrastructure.db.db_helper import db_helper
+from infrastructure.db.unit_of_work import UnitOfWork, get_unit_of_work
 from infrastructure.db.models.base import Base
 from infrastructure.db.models.users import User
 from infrastructure.db.models.refresh_token import RefreshToken
-from infrastructure.db.models.password_reset_token import PasswordResetToken
-
-# REPO
-from infrastructure.repo.user_repo import UserRepository
-from infrastructure.repo.token_repo import TokenRepository
-from infrastructure.repo.reset_token_repo import PasswordResetTokenRepository
+from infrastructure.db.models.user_token import UserToken
+from infrastructure.db.models.revoked_token import RevokedToken
+from infrastructure.db.models.outbox_message import OutboxMessage
 
 # MALING
 from infrastructure.mailing.email_manager import EmailManager, get_email_manager
+from infrastructure.mailing.smtp_pool import smtp_pool
 
 # BROKER
-from infrastructure.broker import broker
+from infrastructure.broker import broker, publisher, publish_auth_event
+
+# REPO
+from infrastructure.repo.user_repo import UserRepository
+from infrastructure.repo.token_repo import RefreshTokenRepository
+from infrastructure.repo.user_token_repo import UserTokenRepository
+from infrastructure.repo.revoked_token_repo import RevokedTokenRepository
+from infrastructure.repo.outbox_repo import OutboxRepository
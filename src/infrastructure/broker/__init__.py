@@ -1,3 +1,3 @@
-__all__ = ["broker"]
+__all__ = ["broker", "publisher", "publish_auth_event"]
 
-from .rb_broker import broker
+from .rb_broker import broker, publisher, publish_auth_event
@@ -0,0 +1,70 @@
+from bisect import bisect_left
+from collections import deque
+import time
+
+# upper bounds in milliseconds, the last bucket catches everything above
+LATENCY_BUCKETS_MS: tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class ConsumerMetrics:
+    """
+    Per-queue handler latency histogram, outcome counters and throughput
+    over a sliding window.
+    """
+
+    def __init__(
+        self,
+        queue: str,
+        window_seconds: float = 60.0,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS_MS,
+    ) -> None:
+        self.queue = queue
+        self._window = window_seconds
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._recent: deque[float] = deque()
+        self.in_flight = 0
+        self.processed = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self.latency_ms_total = 0.0
+        self.latency_ms_max = 0.0
+
+    def observe(self, latency_ms: float) -> None:
+        now = time.monotonic()
+        self._recent.append(now)
+        self._counts[bisect_left(self._buckets, latency_ms)] += 1
+        self.processed += 1
+        self.latency_ms_total += latency_ms
+        self.latency_ms_max = max(self.latency_ms_max, latency_ms)
+
+    @property
+    def per_minute(self) -> float:
+        cutoff = time.monotonic() - self._window
+        while self._recent and self._recent[0] < cutoff:
+            self._recent.popleft()
+        return len(self._recent) * 60 / self._window
+
+    @property
+    def histogram(self) -> dict[str, int]:
+        labels = [f"le_{b:g}ms" for b in self._buckets] + ["le_inf"]
+        cumulative, result = 0, {}
+        for label, count in zip(labels, self._counts):
+            cumulative += count
+            result[label] = cumulative
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            "queue": self.queue,
+            "in_flight": self.in_flight,
+            "processed": self.processed,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "per_minute": self.per_minute,
+            "latency_ms_avg": round(
+                self.latency_ms_total / self.processed if self.processed else 0.0, 3
+            ),
+            "latency_ms_max": round(self.latency_ms_max, 3),
+            "latency_ms_histogram": self.histogram,
+        }
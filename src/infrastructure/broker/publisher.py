@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+from faststream.rabbit import RabbitBroker, RabbitExchange, RabbitQueue
+from pamqp.commands import Basic
+from typing import Any
+import asyncio
+import time
+
+
+@dataclass(slots=True)
+class OutgoingMessage:
+    message: Any
+    queue: RabbitQueue | str = ""
+    exchange: RabbitExchange | str | None = None
+    persist: bool = True
+
+
+class BatchPublisher:
+    """
+    Publishes a batch of messages with publisher confirms.
+
+    Every message of a batch is published concurrently on the confirm-mode
+    channel and the whole batch waits at most ``confirm_timeout`` for broker
+    acks. Retrying what was not confirmed is left to the caller.
+    """
+
+    def __init__(self, broker: RabbitBroker, *, confirm_timeout: float) -> None:
+        self._broker = broker
+        self._confirm_timeout = confirm_timeout
+        self.published = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.last_flush_seconds = 0.0
+
+    async def _send(self, item: OutgoingMessage) -> None:
+        confirmation = await self._broker.publish(
+            item.message,
+            queue=item.queue,
+            exchange=item.exchange,
+            persist=item.persist,
+            timeout=self._confirm_timeout,
+        )
+        if isinstance(confirmation, Basic.Nack):
+            raise RuntimeError("Message was nacked by the broker")
+
+    async def flush(self, batch: list[OutgoingMessage]) -> list[OutgoingMessage]:
+        """
+        Publish ``batch`` and return the messages that were not confirmed.
+        """
+        started = time.monotonic()
+        sends = [asyncio.ensure_future(self._send(item)) for item in batch]
+        done, pending = await asyncio.wait(sends, timeout=self._confirm_timeout)
+        for send in pending:
+            send.cancel()
+
+        failed = []
+        for item, send in zip(batch, sends):
+            if send in done and send.exception() is None:
+                self.published += 1
+            else:
+                failed.append(item)
+
+        self.failed += len(failed)
+        self.batches += 1
+        self.last_batch_size = len(batch)
+        self.last_flush_seconds = time.monotonic() - started
+        return failed
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "published": self.published,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_batch_size": self.last_batch_size,
+            "last_flush_seconds": round(self.last_flush_seconds, 6),
+        }
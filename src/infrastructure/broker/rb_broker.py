@@ -1,11 +1,57 @@
 from faststream.rabbit import RabbitBroker
 from core import settings
 from faststream import FastStream
-from infrastructure.broker.routers.mailing_consumer import mailing_router
+from infrastructure.broker.routers.mailing_consumer import (
+    mailing_router,
+    declare_mailing_queues,
+)
+from infrastructure.broker.routers.auth_events import (
+    auth_events_router,
+    auth_events_exchange,
+)
+from infrastructure.broker.publisher import BatchPublisher
+from infrastructure.mailing.smtp_pool import smtp_pool
+from schemas.auth_schemas import AuthEventPayloadBroker
+import logging
+
+log = logging.getLogger(__name__)
 
 broker = RabbitBroker(url=settings.br.rabbit_dsn)
 
 app = FastStream(broker)
 
 
+@app.on_startup
+async def start_smtp_pool() -> None:
+    smtp_pool.start()
+
+
+@app.after_startup
+async def declare_queues() -> None:
+    await declare_mailing_queues(broker)
+
+
+@app.after_shutdown
+async def close_smtp_pool() -> None:
+    await smtp_pool.close()
+
+
 broker.include_router(mailing_router)
+broker.include_router(auth_events_router)
+
+publisher = BatchPublisher(
+    broker, confirm_timeout=settings.br.publisher_confirm_timeout_seconds
+)
+
+
+async def publish_auth_event(event: AuthEventPayloadBroker) -> None:
+    """
+    Fan an invalidation event out to every worker. Failures are logged only:
+    local caches still expire on their own TTL.
+    """
+    if not settings.br.enable_broker:
+        return
+    try:
+        await broker.publish(event, exchange=auth_events_exchange)
+    except Exception:
+        log.exception("Failed to publish auth event %s", event.event)
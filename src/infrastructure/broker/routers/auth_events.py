@@ -0,0 +1,27 @@
+from faststream.rabbit import RabbitRouter, RabbitExchange, RabbitQueue, ExchangeType
+
+from schemas.auth_schemas import AuthEventPayloadBroker
+from schemas.base_schemas import AuthEventTypeEnum
+from infrastructure.cache import user_cache, revocation_list
+import uuid
+
+auth_events_router = RabbitRouter()
+
+auth_events_exchange = RabbitExchange("auth-events", type=ExchangeType.FANOUT)
+
+# every worker gets its own short-lived queue bound to the fanout exchange
+auth_events_queue = RabbitQueue(
+    f"auth-events.{uuid.uuid4().hex}",
+    exclusive=True,
+    auto_delete=True,
+)
+
+
+@auth_events_router.subscriber(queue=auth_events_queue, exchange=auth_events_exchange)
+async def auth_events_listener(event: AuthEventPayloadBroker):
+    if event.event == AuthEventTypeEnum.user_updated:
+        await user_cache.invalidate(user_id=event.user_id, email=event.email)
+    elif event.event == AuthEventTypeEnum.users_flushed:
+        await user_cache.clear()
+    elif event.event == AuthEventTypeEnum.logout and event.jti:
+        revocation_list.add(event.jti)
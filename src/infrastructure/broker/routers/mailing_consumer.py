@@ -1,21 +1,107 @@
-from faststream.rabbit import RabbitRouter
+from faststream.rabbit import RabbitRouter, RabbitQueue, Channel
+from faststream.rabbit.annotations import RabbitBroker, RabbitMessage
+from faststream.exceptions import NackMessage
+from faststream.middlewares import AckPolicy
 from faststream import Depends
 
 from schemas.auth_schemas import ResetPasswordEmailPayloadBroker
 from infrastructure import EmailManager, get_email_manager
+from infrastructure.broker.consumer_metrics import ConsumerMetrics
 from typing import Annotated
 from core import settings
+import asyncio
+import logging
+import time
+
+log = logging.getLogger(__name__)
 
 mailing_router = RabbitRouter()
 
+RETRY_HEADER = "x-retry-attempt"
+
+password_reset_queue = RabbitQueue("password-reset-request")
+
+# a failed message waits in retry queue N for base * 2**N, then its TTL
+# dead-letters it back onto the main queue
+password_reset_retry_queues = [
+    RabbitQueue(
+        f"{password_reset_queue.name}.retry.{attempt}",
+        durable=True,
+        arguments={
+            "x-message-ttl": int(
+                settings.mail.retry_base_delay_seconds * 2**attempt * 1000
+            ),
+            "x-dead-letter-exchange": "",
+            "x-dead-letter-routing-key": password_reset_queue.name,
+        },
+    )
+    for attempt in range(settings.mail.max_retries)
+]
+password_reset_dead_letter_queue = RabbitQueue(
+    f"{password_reset_queue.name}.dlq", durable=True
+)
+
+password_reset_metrics = ConsumerMetrics(password_reset_queue.name)
+
+_send_slots = asyncio.Semaphore(settings.mail.consumer_concurrency)
+
+
+async def declare_mailing_queues(broker: RabbitBroker) -> None:
+    for queue in (*password_reset_retry_queues, password_reset_dead_letter_queue):
+        await broker.declare_queue(queue)
 
-@mailing_router.subscriber(queue="password-reset-request")
+
+async def retry_or_dead_letter(
+    broker: RabbitBroker,
+    data: ResetPasswordEmailPayloadBroker,
+    attempt: int,
+) -> None:
+    if attempt < len(password_reset_retry_queues):
+        queue = password_reset_retry_queues[attempt]
+        password_reset_metrics.retried += 1
+    else:
+        queue = password_reset_dead_letter_queue
+        password_reset_metrics.dead_lettered += 1
+        log.error(
+            "Reset email to %s dead-lettered after %d attempts", data.email, attempt
+        )
+
+    try:
+        await broker.publish(
+            data, queue=queue, headers={RETRY_HEADER: attempt + 1}, persist=True
+        )
+    except Exception:
+        # keep the message rather than losing it, the broker redelivers it
+        raise NackMessage()
+
+
+@mailing_router.subscriber(
+    queue=password_reset_queue,
+    channel=Channel(prefetch_count=settings.mail.consumer_prefetch),
+    # undecodable messages are dropped instead of redelivered forever
+    ack_policy=AckPolicy.REJECT_ON_ERROR,
+)
 async def password_reset_request_notifications(
     data: ResetPasswordEmailPayloadBroker,
+    message: RabbitMessage,
+    broker: RabbitBroker,
     email_manager: Annotated["EmailManager", Depends(get_email_manager)],
 ):
-    await email_manager.send_email_reset_pass(
-        email_recipient=data.email,
-        reset_token=data.token,
-        reset_url=settings.fron.reset_password_url,
-    )
+    attempt = int((message.headers or {}).get(RETRY_HEADER, 0))
+
+    async with _send_slots:
+        password_reset_metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await email_manager.send_email_reset_pass(
+                email_recipient=data.email,
+                reset_token=data.token,
+                reset_url=settings.fron.reset_password_url,
+            )
+        except Exception:
+            log.exception("Reset email to %s failed", data.email)
+            await retry_or_dead_letter(broker, data, attempt)
+        else:
+            password_reset_metrics.observe((time.perf_counter() - started) * 1000)
+        finally:
+            password_reset_metrics.in_flight -= 1
@@ -0,0 +1,14 @@
+__all__ = [
+    "CacheBackend",
+    "InMemoryTTLCache",
+    "UserCache",
+    "user_cache",
+    "BloomFilter",
+    "RevocationList",
+    "revocation_list",
+]
+
+from infrastructure.cache.backends import CacheBackend, InMemoryTTLCache
+from infrastructure.cache.user_cache import UserCache, user_cache
+from infrastructure.cache.bloom import BloomFilter
+from infrastructure.cache.revocation import RevocationList, revocation_list
@@ -0,0 +1,98 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+import time
+
+
+class CacheBackend(ABC):
+    """
+    Async key/value interface so the in-process cache can be swapped for a
+    shared one (e.g. Redis) without touching callers.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        pass
+
+    @abstractmethod
+    async def peek(self, key: str) -> Any | None:
+        """
+        Like ``get`` but without touching hit/miss stats or recency.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        pass
+
+    @property
+    @abstractmethod
+    def stats(self) -> dict:
+        pass
+
+
+class InMemoryTTLCache(CacheBackend):
+    """
+    Bounded LRU cache with a per-entry TTL, local to one worker process.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> Any | None:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def peek(self, key: str) -> Any | None:
+        item = self._data.get(key)
+        if item is None or item[0] < time.monotonic():
+            return None
+        return item[1]
+
+    async def set(self, key: str, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
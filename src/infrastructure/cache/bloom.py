@@ -0,0 +1,61 @@
+from typing import Iterable
+import math
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Bit positions come from double hashing the builtin (per-process salted,
+    cached on the str) hash, so the filter must never be shared between
+    processes; every worker builds its own.
+    """
+
+    def __init__(self, bit_count: int, hash_count: int) -> None:
+        self.bit_count = max(bit_count, 8)
+        self.hash_count = max(hash_count, 1)
+        self._bits = bytearray((self.bit_count + 7) // 8)
+        self.items = 0
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomFilter":
+        capacity = max(capacity, 1)
+        bit_count = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        hash_count = round(bit_count / capacity * math.log(2))
+        return cls(bit_count, hash_count)
+
+    @classmethod
+    def from_items(
+        cls, items: Iterable[str], capacity: int, error_rate: float
+    ) -> "BloomFilter":
+        bloom = cls.for_capacity(capacity, error_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    @staticmethod
+    def _hashes(item: str) -> tuple[int, int]:
+        value = hash(item) & 0xFFFFFFFFFFFFFFFF
+        return value & 0xFFFFFFFF, (value >> 32) | 1
+
+    def add(self, item: str) -> None:
+        h1, h2 = self._hashes(item)
+        bits, bit_count = self._bits, self.bit_count
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % bit_count
+            bits[position >> 3] |= 1 << (position & 7)
+        self.items += 1
+
+    def __contains__(self, item: str) -> bool:
+        # most lookups miss, so bail out on the first unset bit
+        h1, h2 = self._hashes(item)
+        bits, bit_count = self._bits, self.bit_count
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % bit_count
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
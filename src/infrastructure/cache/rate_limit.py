@@ -0,0 +1,83 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import time
+
+
+class RateLimitBackend(ABC):
+    """
+    Fixed-window counters for sliding-window rate limiting. The in-process
+    backend can be swapped for a shared one (e.g. Redis INCR + EXPIRE) so
+    limits hold across workers.
+    """
+
+    @abstractmethod
+    async def get(self, key: str, window: float) -> tuple[int, int, float]:
+        """
+        Return ``(previous, current, elapsed)``: counts of the previous and
+        current fixed window and seconds elapsed in the current one.
+        """
+
+    @abstractmethod
+    async def incr(self, key: str, window: float) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        pass
+
+    @property
+    @abstractmethod
+    def stats(self) -> dict:
+        pass
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-key ``[window_index, previous, current]`` triples in a bounded LRU,
+    local to one worker process.
+    """
+
+    def __init__(self, max_keys: int) -> None:
+        self._max_keys = max_keys
+        self._data: OrderedDict[str, list[int]] = OrderedDict()
+        self.evictions = 0
+
+    @staticmethod
+    def _roll(entry: list[int], index: int) -> None:
+        if entry[0] == index:
+            return
+        entry[1] = entry[2] if entry[0] == index - 1 else 0
+        entry[2] = 0
+        entry[0] = index
+
+    async def get(self, key: str, window: float) -> tuple[int, int, float]:
+        now = time.time()
+        index = int(now // window)
+        if (entry := self._data.get(key)) is None:
+            return 0, 0, now - index * window
+        self._roll(entry, index)
+        return entry[1], entry[2], now - index * window
+
+    async def incr(self, key: str, window: float) -> None:
+        index = int(time.time() // window)
+        if (entry := self._data.get(key)) is None:
+            entry = self._data[key] = [index, 0, 0]
+            while len(self._data) > self._max_keys:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._data.move_to_end(key)
+            self._roll(entry, index)
+        entry[2] += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._data),
+            "max_keys": self._max_keys,
+            "evictions": self.evictions,
+        }
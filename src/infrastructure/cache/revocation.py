@@ -0,0 +1,140 @@
+from core.config import settings
+from infrastructure import db_helper
+from infrastructure.cache.bloom import BloomFilter
+from infrastructure.repo.revoked_token_repo import RevokedTokenRepository
+import asyncio
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """
+    Per-worker Bloom filter over revoked access-token jtis in front of the
+    ``revoked_tokens`` table.
+
+    A jti that is not in the filter is definitely not revoked, so the common
+    case needs no I/O. Filter hits are confirmed against the table. New
+    revocations are added incrementally (locally and from the auth-events
+    bus) and the filter is rebuilt periodically so expired jtis drop out.
+    The first build runs at startup before requests are served; only if it
+    fails do lookups go to the table until a rebuild succeeds.
+    """
+
+    def __init__(
+        self,
+        *,
+        capacity: int,
+        error_rate: float,
+        rebuild_interval: float,
+    ) -> None:
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._rebuild_interval = rebuild_interval
+        self._filter = BloomFilter.for_capacity(capacity, error_rate)
+        self._ready = False
+        # jtis added while a rebuild is reading the table
+        self._added_during_rebuild: list[str] | None = None
+        self._task: asyncio.Task | None = None
+        self.fast_path = 0
+        self.store_lookups = 0
+        self.false_positives = 0
+        self.rebuilds = 0
+        self.last_rebuild_at: float | None = None
+
+    def add(self, jti: str) -> None:
+        if self._added_during_rebuild is not None:
+            self._added_during_rebuild.append(jti)
+        # the revoking worker sees its own revocation again on the fanout
+        if jti not in self._filter:
+            self._filter.add(jti)
+
+    def might_be_revoked(self, jti: str) -> bool:
+        return not self._ready or jti in self._filter
+
+    async def _is_revoked_in_store(self, jti: str) -> bool:
+        async with db_helper.get_session() as session:
+            return await RevokedTokenRepository(session).is_revoked(jti)
+
+    async def is_revoked(self, jti: str) -> bool:
+        if not self.might_be_revoked(jti):
+            self.fast_path += 1
+            return False
+
+        self.store_lookups += 1
+        revoked = await self._is_revoked_in_store(jti)
+        if not revoked and self._ready:
+            self.false_positives += 1
+        return revoked
+
+    async def _load_jtis(self) -> list[str]:
+        async with db_helper.get_session() as session:
+            return [
+                jti async for jti in RevokedTokenRepository(session).iter_active_jtis()
+            ]
+
+    async def rebuild(self) -> None:
+        self._added_during_rebuild = []
+        try:
+            jtis = await self._load_jtis()
+            jtis = list(dict.fromkeys(jtis + self._added_during_rebuild))
+            # leave headroom so incremental adds keep the error rate
+            capacity = max(self._capacity, len(jtis) * 2)
+            self._filter = BloomFilter.from_items(jtis, capacity, self._error_rate)
+        finally:
+            self._added_during_rebuild = None
+
+        self._ready = True
+        self.rebuilds += 1
+        self.last_rebuild_at = time.time()
+        log.info("Revocation filter rebuilt with %d jtis", len(jtis))
+
+    async def _run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._rebuild_interval)
+            try:
+                await self.rebuild()
+            except Exception:
+                log.exception("Revocation filter rebuild failed")
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        try:
+            await self.rebuild()
+        except Exception:
+            log.exception("Initial revocation filter build failed")
+        self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "ready": self._ready,
+            "items": self._filter.items,
+            "bits": self._filter.bit_count,
+            "hashes": self._filter.hash_count,
+            "bytes": self._filter.size_bytes,
+            "fast_path": self.fast_path,
+            "store_lookups": self.store_lookups,
+            "false_positives": self.false_positives,
+            "rebuilds": self.rebuilds,
+            "last_rebuild_at": self.last_rebuild_at,
+        }
+
+
+revocation_list = RevocationList(
+    capacity=settings.revocation.expected_items,
+    error_rate=settings.revocation.false_positive_rate,
+    rebuild_interval=settings.revocation.rebuild_interval_seconds,
+)
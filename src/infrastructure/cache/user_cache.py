@@ -0,0 +1,70 @@
+from infrastructure.cache.backends import CacheBackend, InMemoryTTLCache
+from core.config import settings
+
+
+class UserCache:
+    """
+    User rows cached as plain column dicts, addressable by id and by email.
+
+    The email key only stores the user id, so invalidating by id is enough
+    to make both lookups miss. Emails are matched exactly, like the
+    ``users.email`` column; they are normalised before they get here.
+    """
+
+    def __init__(self, backend: CacheBackend, enabled: bool = True) -> None:
+        self._backend = backend
+        self.enabled = enabled
+
+    @staticmethod
+    def _id_key(user_id: int) -> str:
+        return f"user:id:{user_id}"
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        return f"user:email:{email}"
+
+    async def get_by_id(self, user_id: int) -> dict | None:
+        if not self.enabled:
+            return None
+        return await self._backend.get(self._id_key(user_id))
+
+    async def get_by_email(self, email: str) -> dict | None:
+        if not self.enabled:
+            return None
+        if (user_id := await self._backend.get(self._email_key(email))) is None:
+            return None
+        # one logical lookup, counted once by the email key above
+        data = await self._backend.peek(self._id_key(user_id))
+        if data is None or data["email"] != email:
+            return None
+        return data
+
+    async def set(self, data: dict) -> None:
+        if not self.enabled:
+            return
+        await self._backend.set(self._id_key(data["id"]), data)
+        await self._backend.set(self._email_key(data["email"]), data["id"])
+
+    async def invalidate(self, user_id: int, email: str | None = None) -> None:
+        keys = [self._id_key(user_id)]
+        if email is None and (cached := await self._backend.peek(keys[0])):
+            email = cached["email"]
+        if email is not None:
+            keys.append(self._email_key(email))
+        await self._backend.delete(*keys)
+
+    async def clear(self) -> None:
+        await self._backend.clear()
+
+    @property
+    def stats(self) -> dict:
+        return self._backend.stats
+
+
+user_cache = UserCache(
+    backend=InMemoryTTLCache(
+        max_size=settings.cache.user_cache_max_size,
+        ttl=settings.cache.user_cache_ttl_seconds,
+    ),
+    enabled=settings.cache.user_cache_enabled,
+)
@@ -2,12 +2,14 @@ from contextlib import asynccontextmanager
 from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
+    AsyncConnection,
     AsyncEngine,
     AsyncSession,
 )
 from typing import AsyncGenerator
 from sqlalchemy.engine import URL
 from core.config import settings
+from infrastructure.db.pool_metrics import InstrumentedAsyncQueuePool, PoolStats
 
 
 class DBHelper:
@@ -16,11 +18,34 @@ class DBHelper:
         *,
         url: str | URL,
         echo: bool,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False,
+        prepared_statement_cache_size: int = 100,
+        statement_timeout_ms: int | None = None,
     ) -> None:
+        server_settings = {}
+        if statement_timeout_ms is not None:
+            server_settings["statement_timeout"] = str(statement_timeout_ms)
+
+        self.pool_stats = PoolStats()
         self._engine: AsyncEngine = create_async_engine(
             url,
             echo=echo,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+            connect_args={
+                "prepared_statement_cache_size": prepared_statement_cache_size,
+                "server_settings": server_settings,
+            },
         )
+        self._engine.sync_engine.pool.stats = self.pool_stats
         self._async_session_maker: async_sessionmaker[AsyncSession] = (
             async_sessionmaker(
                 bind=self._engine,
@@ -40,6 +65,25 @@ class DBHelper:
                 await session.rollback()
                 raise
 
+    @asynccontextmanager
+    async def get_autocommit_connection(self) -> AsyncGenerator[AsyncConnection, None]:
+        """
+        Raw connection outside any transaction block, for statements such as
+        ``DETACH PARTITION ... CONCURRENTLY`` and session-level advisory locks.
+        """
+        async with self._engine.connect() as conn:
+            yield await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+    def pool_status(self) -> dict:
+        pool = self._engine.sync_engine.pool
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            **self.pool_stats.to_dict(),
+        }
+
     async def dispose(self):
         await self._engine.dispose()
 
@@ -47,4 +91,11 @@ class DBHelper:
 db_helper = DBHelper(
     url=settings.db.dsn,
     echo=settings.db.echo,
+    pool_size=settings.db.pool_size,
+    max_overflow=settings.db.max_overflow,
+    pool_timeout=settings.db.pool_timeout,
+    pool_recycle=settings.db.pool_recycle,
+    pool_pre_ping=settings.db.pool_pre_ping,
+    prepared_statement_cache_size=settings.db.prepared_statement_cache_size,
+    statement_timeout_ms=settings.db.statement_timeout_ms,
 )
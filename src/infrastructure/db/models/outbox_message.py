@@ -0,0 +1,25 @@
+from infrastructure import Base
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import TIMESTAMP, func
+from datetime import datetime
+
+
+class OutboxMessage(Base):
+    # broker messages written in the business transaction, relayed later
+    queue: Mapped[str] = mapped_column(nullable=False, default="")
+    exchange: Mapped[str | None] = mapped_column(nullable=True)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    attempts: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+    available_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        index=True,
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(id={self.id}, queue={self.queue},"
+            f"attempts={self.attempts})"
+        )
@@ -10,10 +10,15 @@ if TYPE_CHECKING:
 
 
 class RefreshToken(Base):
+    # range-partitioned by day, see infrastructure.db.partitions
+    __table_args__ = {"postgresql_partition_by": "RANGE (expires_at)"}
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
-    jti: Mapped[str] = mapped_column(unique=True, index=True, nullable=False)
-    expires_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True))
+    jti: Mapped[str] = mapped_column(index=True, nullable=False)
+    # the partition key has to be part of the primary key
+    expires_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), primary_key=True
+    )
 
     user: Mapped["User"] = relationship("User", back_populates="refresh_tokens")
 
@@ -0,0 +1,19 @@
+from infrastructure import Base
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, TIMESTAMP
+from datetime import datetime
+
+
+class RevokedToken(Base):
+    # revoked access-token jtis, kept until the token would have expired
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    jti: Mapped[str] = mapped_column(unique=True, index=True, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(id={self.id}, user_id={self.user_id},"
+            f"expires_at={self.expires_at})"
+        )
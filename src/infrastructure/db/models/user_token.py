@@ -1,6 +1,6 @@
 from infrastructure import Base
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey, TIMESTAMP, Enum as SQLEnum
+from sqlalchemy import ForeignKey, Index, TIMESTAMP, Enum as SQLEnum
 from datetime import datetime
 
 from typing import TYPE_CHECKING
@@ -12,12 +12,24 @@ if TYPE_CHECKING:
 
 
 class UserToken(Base):
+    # range-partitioned by day, see infrastructure.db.partitions
+    __table_args__ = (
+        # recent-token lookups used to coalesce reset requests
+        Index(
+            "ix_user_tokens_user_id_token_type_created_at",
+            "user_id",
+            "token_type",
+            "created_at",
+        ),
+        {"postgresql_partition_by": "RANGE (expires_at)"},
+    )
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
-    lookup_hash: Mapped[str] = mapped_column(unique=True, index=True, nullable=False)
+    lookup_hash: Mapped[str] = mapped_column(index=True, nullable=False)
     hashed_token: Mapped[str] = mapped_column(nullable=False)
+    # the partition key has to be part of the primary key
     expires_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=True), nullable=False
+        TIMESTAMP(timezone=True), primary_key=True
     )
     token_type: Mapped[TokenTypeEnum] = mapped_column(
         SQLEnum(TokenTypeEnum, native_enum=False), nullable=False
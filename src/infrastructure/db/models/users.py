@@ -1,19 +1,15 @@
 from infrastructure import Base
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import VARCHAR, Enum as SQLEnum
-from enum import StrEnum
+from sqlalchemy import VARCHAR, Enum as SQLEnum, Index, func
 
 from typing import TYPE_CHECKING
 
+from schemas.base_schemas import UserRole
+
 if TYPE_CHECKING:
     from infrastructure import RefreshToken, UserToken
 
 
-class UserRole(StrEnum):
-    user = "user"
-    admin = "admin"
-
-
 class User(Base):
     first_name: Mapped[str] = mapped_column(VARCHAR(50))
     last_name: Mapped[str] = mapped_column(VARCHAR(50), nullable=True)
@@ -37,6 +33,10 @@ class User(Base):
     is_verified: Mapped[bool] = mapped_column(
         default=False, server_default="false", nullable=False
     )
+    # embedded in every JWT as "ver", bumping it logs out every session
+    token_version: Mapped[int] = mapped_column(
+        default=0, server_default="0", nullable=False
+    )
 
     refresh_tokens: Mapped[list["RefreshToken"]] = relationship(
         "RefreshToken",
@@ -70,3 +70,7 @@ class User(Base):
             "created_at": self.created_at,
             "updated_at": self.updated_at,
         }
+
+
+# emails are stored lower-cased; this keeps case variants out too
+Index("ux_users_email_lower", func.lower(User.email), unique=True)
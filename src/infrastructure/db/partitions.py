@@ -0,0 +1,157 @@
+"""
+Daily range partitions on ``expires_at`` for the token tables.
+
+Expired tokens are removed by detaching and dropping whole partitions
+instead of row-by-row deletes. There is no default partition, so
+partitions have to be created ahead of the longest token lifetime.
+Maintenance runs in one worker at a time, behind a Postgres advisory
+lock. Run it as a maintenance command::
+
+    python -m infrastructure.db.partitions --days-ahead 14
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy import text
+from core.config import settings
+from infrastructure.db.db_helper import db_helper
+import argparse
+import asyncio
+import logging
+import re
+
+log = logging.getLogger(__name__)
+
+PARTITIONED_TABLES: tuple[str, ...] = ("refresh_tokens", "user_tokens")
+
+_PARTITION_RE = re.compile(r"^(?P<table>\w+)_p(?P<day>\d{8})$")
+
+# advisory lock key shared by every process running partition maintenance
+MAINTENANCE_LOCK_ID = 7_301_115
+
+
+async def _partitions(conn: AsyncConnection) -> dict[str, bool]:
+    """
+    Existing partitions of the token tables, mapped to whether a concurrent
+    detach of them was interrupted and still has to be finalized.
+    """
+    res = await conn.execute(
+        text(
+            "SELECT child.relname, pg_inherits.inhdetachpending FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = ANY(:tables)"
+        ),
+        {"tables": list(PARTITIONED_TABLES)},
+    )
+    return {name: pending for name, pending in res.all()}
+
+
+def partition_name(table: str, day: date) -> str:
+    return f"{table}_p{day:%Y%m%d}"
+
+
+def create_partition_sql(table: str, day: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, day)} "
+        f"PARTITION OF {table} "
+        f"FOR VALUES FROM ('{day.isoformat()} 00:00:00+00') "
+        f"TO ('{(day + timedelta(days=1)).isoformat()} 00:00:00+00')"
+    )
+
+
+def create_default_partition_sql(table: str) -> str:
+    return f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+async def create_future_partitions(
+    conn: AsyncConnection,
+    days_ahead: int,
+    today: date | None = None,
+) -> list[str]:
+    """
+    Create the missing partitions from today to ``today + days_ahead``.
+    ``days_ahead`` must exceed the longest token lifetime, inserts past the
+    last partition fail.
+    """
+    today = today or _today()
+    existing = await _partitions(conn)
+    created = []
+    for table in PARTITIONED_TABLES:
+        for offset in range(days_ahead + 1):
+            day = today + timedelta(days=offset)
+            if (name := partition_name(table, day)) in existing:
+                continue
+            await conn.execute(text(create_partition_sql(table, day)))
+            created.append(name)
+    return created
+
+
+async def drop_expired_partitions(
+    conn: AsyncConnection,
+    today: date | None = None,
+) -> list[str]:
+    """
+    Detach, without blocking token reads and inserts, and drop every daily
+    partition whose upper bound is already in the past. ``conn`` must be
+    in autocommit mode.
+    """
+    today = today or _today()
+    dropped = []
+    for name, detach_pending in (await _partitions(conn)).items():
+        if not (match := _PARTITION_RE.match(name)):
+            continue
+        day = datetime.strptime(match["day"], "%Y%m%d").date()
+        if day >= today:
+            continue
+        mode = "FINALIZE" if detach_pending else "CONCURRENTLY"
+        await conn.execute(
+            text(f"ALTER TABLE {match['table']} DETACH PARTITION {name} {mode}")
+        )
+        await conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        dropped.append(name)
+    return dropped
+
+
+async def maintain_partitions(days_ahead: int) -> dict[str, list[str]]:
+    days_ahead = max(days_ahead, settings.jwt.refresh_expire_day + 1)
+
+    async with db_helper.get_autocommit_connection() as conn:
+        locked = await conn.scalar(
+            text("SELECT pg_try_advisory_lock(:id)"), {"id": MAINTENANCE_LOCK_ID}
+        )
+        if not locked:
+            log.debug("Partition maintenance is running elsewhere, skipping")
+            return {"created": [], "dropped": []}
+        try:
+            created = await create_future_partitions(conn, days_ahead=days_ahead)
+            dropped = await drop_expired_partitions(conn)
+        finally:
+            await conn.execute(
+                text("SELECT pg_advisory_unlock(:id)"), {"id": MAINTENANCE_LOCK_ID}
+            )
+
+    log.info("Partition maintenance created %s, dropped %s", created, dropped)
+    return {"created": created, "dropped": dropped}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Token table partition maintenance")
+    parser.add_argument(
+        "--days-ahead",
+        type=int,
+        default=settings.sweeper.partition_days_ahead,
+        help="How many future daily partitions to keep ready",
+    )
+    args = parser.parse_args()
+
+    result = await maintain_partitions(days_ahead=args.days_ahead)
+    print(f"created: {result['created']}, dropped: {result['dropped']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from bisect import bisect_left
+import time
+
+# upper bounds in milliseconds, the last bucket catches everything above
+WAIT_BUCKETS_MS: tuple[float, ...] = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+def _cumulative(buckets: tuple[float, ...], counts: list[int]) -> dict[str, int]:
+    labels = [f"le_{b:g}ms" for b in buckets] + ["le_inf"]
+    cumulative, result = 0, {}
+    for label, count in zip(labels, counts):
+        cumulative += count
+        result[label] = cumulative
+    return result
+
+
+class PoolStats:
+    """
+    Histograms of how long checkouts waited for a free connection and how
+    long opening new connections took.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = WAIT_BUCKETS_MS) -> None:
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._connect_counts = [0] * (len(buckets) + 1)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.connects = 0
+        self.connect_ms_total = 0.0
+        self.connect_ms_max = 0.0
+
+    def observe(self, wait_ms: float) -> None:
+        self._counts[bisect_left(self._buckets, wait_ms)] += 1
+        self.checkouts += 1
+        self.wait_ms_total += wait_ms
+        self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def observe_connect(self, connect_ms: float) -> None:
+        self._connect_counts[bisect_left(self._buckets, connect_ms)] += 1
+        self.connects += 1
+        self.connect_ms_total += connect_ms
+        self.connect_ms_max = max(self.connect_ms_max, connect_ms)
+
+    @property
+    def histogram(self) -> dict[str, int]:
+        return _cumulative(self._buckets, self._counts)
+
+    @property
+    def connect_histogram(self) -> dict[str, int]:
+        return _cumulative(self._buckets, self._connect_counts)
+
+    def to_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_ms_total": round(self.wait_ms_total, 3),
+            "wait_ms_max": round(self.wait_ms_max, 3),
+            "wait_ms_histogram": self.histogram,
+            "connects": self.connects,
+            "connect_ms_total": round(self.connect_ms_total, 3),
+            "connect_ms_max": round(self.connect_ms_max, 3),
+            "connect_ms_histogram": self.connect_histogram,
+        }
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long each checkout waited for a
+    free connection, excluding time spent opening a new one (reported
+    separately) and the pre-ping.
+    """
+
+    stats: PoolStats | None = None
+
+    def _do_get(self):
+        record = super()._do_get()
+        # wall clock, to compare with the record's starttime
+        record.got_at = time.time()
+        return record
+
+    def connect(self):
+        if self.stats is None:
+            return super().connect()
+
+        start = time.time()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.stats.timeouts += 1
+            raise
+        end = time.time()
+
+        record = connection._connection_record
+        got_at = record.got_at
+        if start <= record.starttime <= got_at:
+            # the pool opened a new connection for this checkout
+            self.stats.observe_connect((got_at - record.starttime) * 1000)
+            got_at = record.starttime
+        elif record.starttime > got_at:
+            # a recycled or invalidated connection was reopened on checkout
+            self.stats.observe_connect((end - record.starttime) * 1000)
+        self.stats.observe((got_at - start) * 1000)
+        return connection
+
+    def recreate(self) -> "InstrumentedAsyncQueuePool":
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
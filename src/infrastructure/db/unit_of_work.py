@@ -0,0 +1,28 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncGenerator
+from infrastructure.db.db_helper import db_helper
+
+
+class UnitOfWork:
+    """
+    One session shared by every service in a request.
+
+    The session checks a connection out of the pool on its first statement
+    and gives it back on ``commit``, so services commit as soon as their last
+    statement has run instead of holding the connection through hashing,
+    broker calls or response rendering.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+
+
+async def get_unit_of_work() -> AsyncGenerator[UnitOfWork, None]:
+    async with db_helper.get_session() as session:
+        yield UnitOfWork(session)
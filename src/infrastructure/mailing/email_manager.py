@@ -4,6 +4,7 @@ from textwrap import dedent
 from typing import AsyncGenerator
 
 from core import settings, templates
+from infrastructure.mailing.smtp_pool import SMTPConnectionPool, smtp_pool
 import aiosmtplib
 import logging
 
@@ -11,19 +12,8 @@ log = logging.getLogger(__name__)
 
 
 class EmailManager:
-    def __init__(
-        self,
-        host: str = settings.mail.host,
-        post: int = settings.mail.port,
-        username: str = settings.mail.username,
-        password: str = settings.mail.password,
-        use_tls: bool = settings.mail.use_tls,
-    ):
-        self._host = host
-        self._post = post
-        self._username = username
-        self._password = password
-        self._use_tls = use_tls
+    def __init__(self, pool: SMTPConnectionPool = smtp_pool):
+        self._pool = pool
 
     async def _send_email(
         self, recipient: str, subject: str, plain_content: str, html_content: str = ""
@@ -39,14 +29,7 @@ class EmailManager:
             message.attach(MIMEText(html_content, "html", "utf-8"))
 
         try:
-            await aiosmtplib.send(
-                message,
-                hostname=self._host,
-                port=self._post,
-                username=self._username,
-                password=self._password,
-                use_tls=self._use_tls,
-            )
+            await self._pool.send_message(message)
         except aiosmtplib.SMTPException as e:
             log.error("Email send failed: %s", str(e))
             raise
@@ -83,6 +66,8 @@ class EmailManager:
         )
 
 
+email_manager = EmailManager()
+
+
 async def get_email_manager() -> AsyncGenerator[EmailManager, None]:
-    manager = EmailManager()
-    yield manager
+    yield email_manager
@@ -0,0 +1,200 @@
+from contextlib import asynccontextmanager
+from email.message import Message
+from typing import AsyncIterator
+from core import settings
+import aiosmtplib
+import asyncio
+import logging
+
+log = logging.getLogger(__name__)
+
+# errors after which the connection is discarded and the send retried once
+CONNECTION_ERRORS = (
+    aiosmtplib.SMTPServerDisconnected,
+    aiosmtplib.SMTPConnectError,
+    aiosmtplib.SMTPTimeoutError,
+    ConnectionError,
+)
+
+
+class SMTPConnectionPool:
+    """
+    Up to ``size`` persistent, authenticated SMTP connections.
+
+    Connections are opened lazily, reused across messages and checked with
+    NOOP every ``keepalive_interval`` seconds while idle. Broken connections
+    are dropped and reopened on next use; a send that fails because the
+    server went away is retried once on a fresh connection. After a rejected
+    message the connection is RSET before it is reused; after any other
+    error, including cancellation, it is closed.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str,
+        port: int,
+        username: str | None,
+        password: str | None,
+        use_tls: bool,
+        size: int,
+        keepalive_interval: float,
+        timeout: float,
+    ) -> None:
+        self._host = host
+        self._port = port
+        self._username = username
+        self._password = password
+        self._use_tls = use_tls
+        self._size = size
+        self._keepalive_interval = keepalive_interval
+        self._timeout = timeout
+        self._idle: list[aiosmtplib.SMTP] = []
+        self._slots = asyncio.Semaphore(size)
+        self._keepalive_task: asyncio.Task | None = None
+        self.in_use = 0
+        self.opened = 0
+        self.discarded = 0
+        self.sent = 0
+        self.failed = 0
+        self.keepalive_failures = 0
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=self._host,
+            port=self._port,
+            username=self._username,
+            password=self._password,
+            use_tls=self._use_tls,
+            timeout=self._timeout,
+        )
+        # connect() also runs EHLO and, with credentials, AUTH
+        await client.connect()
+        self.opened += 1
+        return client
+
+    async def _discard(self, client: aiosmtplib.SMTP) -> None:
+        self.discarded += 1
+        try:
+            await client.quit()
+        except Exception:
+            client.close()
+
+    async def _acquire(self) -> aiosmtplib.SMTP:
+        while self._idle:
+            client = self._idle.pop()
+            if client.is_connected:
+                return client
+            await self._discard(client)
+        return await self._connect()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        async with self._slots:
+            client = await self._acquire()
+            self.in_use += 1
+            try:
+                yield client
+            except CONNECTION_ERRORS:
+                await self._discard(client)
+                client = None
+                raise
+            except aiosmtplib.SMTPException:
+                # a rejected message can leave the mail transaction open
+                try:
+                    await client.rset()
+                except Exception:
+                    await self._discard(client)
+                    client = None
+                raise
+            except BaseException:
+                # cancelled or failed mid-command, the session state is
+                # unknown; close without awaiting anything
+                self.discarded += 1
+                client.close()
+                client = None
+                raise
+            finally:
+                self.in_use -= 1
+                if client is not None:
+                    self._idle.append(client)
+
+    async def send_message(self, message: Message) -> None:
+        for attempt in range(2):
+            try:
+                async with self.connection() as client:
+                    await client.send_message(message)
+            except CONNECTION_ERRORS:
+                if attempt:
+                    self.failed += 1
+                    raise
+                log.warning("SMTP connection lost, retrying on a new one")
+            except aiosmtplib.SMTPException:
+                self.failed += 1
+                raise
+            else:
+                self.sent += 1
+                return
+
+    async def _keepalive(self) -> None:
+        # one connection at a time, each holding a slot, so concurrent sends
+        # wait for it instead of opening connections beyond ``size``
+        for _ in range(len(self._idle)):
+            async with self._slots:
+                if not self._idle:
+                    return
+                client = self._idle.pop(0)
+                try:
+                    await client.noop()
+                except Exception:
+                    self.keepalive_failures += 1
+                    await self._discard(client)
+                else:
+                    self._idle.append(client)
+
+    async def _run_keepalive(self) -> None:
+        while True:
+            await asyncio.sleep(self._keepalive_interval)
+            await self._keepalive()
+
+    def start(self) -> None:
+        if self._keepalive_task is None:
+            self._keepalive_task = asyncio.create_task(self._run_keepalive())
+
+    async def close(self) -> None:
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            try:
+                await self._keepalive_task
+            except asyncio.CancelledError:
+                pass
+            self._keepalive_task = None
+
+        idle, self._idle = self._idle, []
+        for client in idle:
+            await self._discard(client)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "size": self._size,
+            "idle": len(self._idle),
+            "in_use": self.in_use,
+            "opened": self.opened,
+            "discarded": self.discarded,
+            "sent": self.sent,
+            "failed": self.failed,
+            "keepalive_failures": self.keepalive_failures,
+        }
+
+
+smtp_pool = SMTPConnectionPool(
+    host=settings.mail.host,
+    port=settings.mail.port,
+    username=settings.mail.username,
+    password=settings.mail.password,
+    use_tls=settings.mail.use_tls,
+    size=settings.mail.pool_size,
+    keepalive_interval=settings.mail.keepalive_interval_seconds,
+    timeout=settings.mail.timeout_seconds,
+)
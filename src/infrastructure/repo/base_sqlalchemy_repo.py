@@ -1,6 +1,16 @@
-from typing import TypeVar, Generic, Type, Union, TypeAlias
+from typing import TypeVar, Generic, Type, Union, TypeAlias, Any, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete as delete_sql, update as update_sql
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import (
+    Row,
+    any_,
+    bindparam,
+    func,
+    select,
+    insert as insert_sql,
+    delete as delete_sql,
+    update as update_sql,
+)
 from pydantic import BaseModel
 from dataclasses import is_dataclass, asdict
 from infrastructure import Base
@@ -8,6 +18,8 @@ from infrastructure import Base
 ModelType = TypeVar("ModelType", bound=Base)
 DataType: TypeAlias = Union[BaseModel, object]
 
+DEFAULT_BATCH_SIZE = 1000
+
 
 class BaseSqlalchemyRepo(Generic[ModelType]):
     def __init__(self, model: Type[ModelType], session: AsyncSession):
@@ -22,33 +34,58 @@ class BaseSqlalchemyRepo(Generic[ModelType]):
             return asdict(data)
         raise TypeError("data must be pydantic model or dataclass")
 
+    def _filter(self, filters: dict) -> list:
+        """
+        ``key=value`` becomes ``col = value``; list/tuple/set values become a
+        single ``col = ANY(:array)`` parameter instead of an expanding IN.
+        """
+        clauses = []
+        for key, value in filters.items():
+            column = getattr(self._model, key)
+            if isinstance(value, (list, tuple, set, frozenset)):
+                array = bindparam(None, list(value), type_=ARRAY(column.type))
+                clauses.append(column == any_(array))
+            else:
+                clauses.append(column == value)
+        return clauses
+
+    @staticmethod
+    def _batches(items: Sequence[Any], batch_size: int):
+        for start in range(0, len(items), batch_size):
+            yield items[start : start + batch_size]
+
     async def create(self, data: DataType) -> ModelType:
-        payload = self._dump_data(data)
-        obj = self._model(**payload)
-        self._session.add(obj)
-        await self._session.flush()
-        await self._session.refresh(obj)
-        return obj
+        stmt = (
+            insert_sql(self._model)
+            .values(**self._dump_data(data))
+            .returning(self._model)
+        )
+        res = await self._session.execute(stmt)
+        return res.scalar_one()
+
+    async def create_no_return(self, data: DataType) -> None:
+        await self._session.execute(
+            insert_sql(self._model).values(**self._dump_data(data))
+        )
 
     async def update(self, data: DataType, **filters) -> ModelType | None:
-        payload = self._dump_data(data)
         stmt = (
             update_sql(self._model)
-            .where(
-                *[getattr(self._model, key) == value for key, value in filters.items()],
-            )
-            .values(**payload)
-            .returning(self._model.id)
+            .where(*self._filter(filters))
+            .values(**self._dump_data(data))
+            .returning(self._model)
+            .execution_options(populate_existing=True)
         )
-
         res = await self._session.execute(stmt)
-        await self._session.flush()
-        update_id = res.scalar_one_or_none()
-
-        if update_id is None:
-            return None
+        return res.scalar_one_or_none()
 
-        return await self.find_single(id=update_id)
+    async def update_no_return(self, data: DataType, **filters) -> None:
+        await self._session.execute(
+            update_sql(self._model)
+            .where(*self._filter(filters))
+            .values(**self._dump_data(data))
+            .execution_options(synchronize_session=False)
+        )
 
     async def find_single(self, **filters) -> ModelType | None:
         stmt = select(self._model).filter_by(**filters)
@@ -58,3 +95,91 @@ class BaseSqlalchemyRepo(Generic[ModelType]):
     async def delete(self, **filters) -> None:
         await self._session.execute(delete_sql(self._model).filter_by(**filters))
         await self._session.flush()
+
+    async def create_many(
+        self,
+        data: Sequence[DataType],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        payloads = [self._dump_data(item) for item in data]
+        for batch in self._batches(payloads, batch_size):
+            await self._session.execute(insert_sql(self._model), batch)
+
+    async def find_many(
+        self,
+        *,
+        columns: Sequence[str] | None = None,
+        after_id: int | None = None,
+        limit: int = 100,
+        **filters,
+    ) -> Sequence[ModelType] | Sequence[Row]:
+        """
+        Keyset pagination over ``id``: pass the last id of the previous page
+        as ``after_id``. With ``columns`` only those columns are selected and
+        rows are returned instead of ORM objects.
+        """
+        if columns:
+            stmt = select(*[getattr(self._model, column) for column in columns])
+        else:
+            stmt = select(self._model)
+
+        stmt = stmt.where(*self._filter(filters))
+        if after_id is not None:
+            stmt = stmt.where(self._model.id > after_id)
+        stmt = stmt.order_by(self._model.id).limit(limit)
+
+        res = await self._session.execute(stmt)
+        return res.all() if columns else res.scalars().all()
+
+    async def update_many(
+        self,
+        data: Sequence[dict],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """
+        Bulk UPDATE by primary key, every dict must contain ``id``.
+        """
+        for batch in self._batches(data, batch_size):
+            await self._session.execute(update_sql(self._model), batch)
+
+    async def delete_many(
+        self,
+        ids: Sequence[int],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        deleted = 0
+        for batch in self._batches(list(ids), batch_size):
+            res = await self._session.execute(
+                delete_sql(self._model).where(*self._filter({"id": batch}))
+            )
+            deleted += res.rowcount
+        return deleted
+
+
+class ExpiringRepoMixin:
+    """
+    For repositories of models with an ``expires_at`` column.
+    """
+
+    _model: Any
+    _session: AsyncSession
+
+    async def delete_expired(self, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Delete at most ``batch_size`` rows whose ``expires_at`` has passed.
+        Rows locked by a concurrent sweeper are skipped.
+        """
+        expired_ids = (
+            select(self._model.id)
+            .where(self._model.expires_at < func.now())
+            .order_by(self._model.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        res = await self._session.execute(
+            delete_sql(self._model)
+            .where(self._model.id.in_(expired_ids))
+            .execution_options(synchronize_session=False)
+        )
+        return res.rowcount
@@ -0,0 +1,57 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, update
+from typing import Sequence
+from datetime import timedelta
+from infrastructure import OutboxMessage
+from infrastructure.repo.base_sqlalchemy_repo import BaseSqlalchemyRepo
+
+
+class OutboxRepository(BaseSqlalchemyRepo[OutboxMessage]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(OutboxMessage, session)
+
+    async def claim_batch(self, batch_size: int) -> Sequence[OutboxMessage]:
+        """
+        Lock up to ``batch_size`` due messages, oldest first. Rows locked by
+        another relay are skipped, so relays can run in parallel.
+        """
+        res = await self._session.execute(
+            select(self._model)
+            .where(self._model.available_at <= func.now())
+            .order_by(self._model.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return res.scalars().all()
+
+    async def reschedule(self, ids: Sequence[int], delay: timedelta) -> None:
+        if not ids:
+            return
+        await self._session.execute(
+            update(self._model)
+            .where(*self._filter({"id": ids}))
+            .values(
+                attempts=self._model.attempts + 1,
+                available_at=func.now() + delay,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def backlog(self) -> tuple[int, float]:
+        """
+        Number of unsent messages and how long, in seconds, the oldest due
+        one has been waiting.
+        """
+        res = await self._session.execute(
+            select(
+                func.count(),
+                func.coalesce(
+                    func.extract(
+                        "epoch", func.now() - func.min(self._model.available_at)
+                    ),
+                    0,
+                ),
+            )
+        )
+        pending, oldest_age = res.one()
+        return pending, max(float(oldest_age), 0.0)
@@ -0,0 +1,58 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import exists, func, select
+from typing import AsyncIterator
+from infrastructure import RevokedToken
+from infrastructure.repo.base_sqlalchemy_repo import (
+    BaseSqlalchemyRepo,
+    DataType,
+    ExpiringRepoMixin,
+    DEFAULT_BATCH_SIZE,
+)
+
+
+class RevokedTokenRepository(ExpiringRepoMixin, BaseSqlalchemyRepo[RevokedToken]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(RevokedToken, session)
+
+    async def revoke(self, data: DataType) -> None:
+        await self._session.execute(
+            insert(self._model)
+            .values(**self._dump_data(data))
+            .on_conflict_do_nothing(index_elements=[self._model.jti])
+        )
+
+    async def is_revoked(self, jti: str) -> bool:
+        res = await self._session.execute(
+            select(
+                exists().where(
+                    self._model.jti == jti,
+                    self._model.expires_at > func.now(),
+                )
+            )
+        )
+        return res.scalar_one()
+
+    async def iter_active_jtis(
+        self, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> AsyncIterator[str]:
+        """
+        Keyset-paginated jtis of revoked tokens that have not expired yet.
+        """
+        after_id = 0
+        while True:
+            res = await self._session.execute(
+                select(self._model.id, self._model.jti)
+                .where(
+                    self._model.id > after_id,
+                    self._model.expires_at > func.now(),
+                )
+                .order_by(self._model.id)
+                .limit(batch_size)
+            )
+            rows = res.all()
+            for row in rows:
+                yield row.jti
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1].id
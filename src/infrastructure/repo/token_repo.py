@@ -1,8 +1,46 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, insert, select, literal, func
 from infrastructure import RefreshToken
-from infrastructure.repo.base_sqlalchemy_repo import BaseSqlalchemyRepo
+from infrastructure.repo.base_sqlalchemy_repo import (
+    BaseSqlalchemyRepo,
+    ExpiringRepoMixin,
+)
+from dto.auth_dto import CreateRefreshTokenDTO
 
 
-class RefreshTokenRepository(BaseSqlalchemyRepo[RefreshToken]):
+class RefreshTokenRepository(ExpiringRepoMixin, BaseSqlalchemyRepo[RefreshToken]):
     def __init__(self, session: AsyncSession):
         super().__init__(RefreshToken, session)
+
+    async def rotate(self, old_jti: str, new_token: CreateRefreshTokenDTO) -> bool:
+        """
+        Atomically replace a live refresh token with a new one in a single
+        round-trip. Returns False if ``old_jti`` is unknown, expired or has
+        already been rotated, i.e. the token is being reused.
+        """
+        rotated = (
+            delete(self._model)
+            .where(
+                self._model.jti == old_jti,
+                self._model.user_id == new_token.user_id,
+                self._model.expires_at > func.now(),
+            )
+            .returning(self._model.user_id)
+            .cte("rotated")
+        )
+        stmt = (
+            insert(self._model)
+            .from_select(
+                ["user_id", "jti", "expires_at"],
+                select(
+                    rotated.c.user_id,
+                    literal(new_token.jti, self._model.jti.type),
+                    literal(new_token.expires_at, self._model.expires_at.type),
+                ),
+            )
+            .returning(self._model.id)
+            .add_cte(rotated)
+        )
+
+        res = await self._session.execute(stmt)
+        return res.scalar_one_or_none() is not None
@@ -1,8 +1,173 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from infrastructure import User
-from infrastructure.repo.base_sqlalchemy_repo import BaseSqlalchemyRepo
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy import event, update
+from infrastructure import User, publish_auth_event
+from infrastructure.cache import UserCache, user_cache
+from infrastructure.repo.base_sqlalchemy_repo import BaseSqlalchemyRepo, DataType
+from schemas.auth_schemas import AuthEventPayloadBroker
+from schemas.base_schemas import AuthEventTypeEnum
+from typing import Sequence
+import asyncio
+
+_background_tasks: set[asyncio.Task] = set()
 
 
 class UserRepository(BaseSqlalchemyRepo[User]):
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, cache: UserCache = user_cache):
         super().__init__(User, session)
+        self._cache = cache
+
+    @staticmethod
+    def _snapshot(user: User) -> dict:
+        return {c.key: getattr(user, c.key) for c in User.__mapper__.column_attrs}
+
+    async def _from_snapshot(self, data: dict) -> User:
+        user = User(**data)
+        make_transient_to_detached(user)
+        return await self._session.merge(user, load=False)
+
+    async def find_single(self, **filters) -> User | None:
+        if filters.keys() == {"id"}:
+            data = await self._cache.get_by_id(filters["id"])
+        elif filters.keys() == {"email"}:
+            data = await self._cache.get_by_email(filters["email"])
+        else:
+            return await super().find_single(**filters)
+
+        if data is not None:
+            return await self._from_snapshot(data)
+
+        if (user := await super().find_single(**filters)) is not None:
+            await self._cache.set(self._snapshot(user))
+        return user
+
+    async def get_token_version(self, user_id: int) -> int | None:
+        if (data := await self._cache.get_by_id(user_id)) is not None:
+            return data["token_version"]
+        if (user := await self.find_single(id=user_id)) is not None:
+            return user.token_version
+        return None
+
+    async def set_password(self, user_id: int, hashed_password: str) -> None:
+        """
+        Store a new password hash and bump ``token_version`` in one UPDATE,
+        logging out every token issued before the change.
+        """
+        await self._session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(
+                hashed_password=hashed_password,
+                token_version=User.token_version + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.invalidate(user_id=user_id)
+
+    async def replace_password_hash(
+        self, user_id: int, old_hashed_password: str, new_hashed_password: str
+    ) -> bool:
+        """
+        Compare-and-set of ``hashed_password``: a no-op, returning False,
+        when the stored hash is no longer ``old_hashed_password``.
+        """
+        res = await self._session.execute(
+            update(User)
+            .where(User.id == user_id, User.hashed_password == old_hashed_password)
+            .values(hashed_password=new_hashed_password)
+            .execution_options(synchronize_session=False)
+        )
+        if not res.rowcount:
+            return False
+        await self.invalidate(user_id=user_id)
+        return True
+
+    async def update(self, data: DataType, **filters) -> User | None:
+        user = await super().update(data, **filters)
+        if user is not None:
+            await self.invalidate(user_id=user.id, email=user.email)
+        return user
+
+    async def update_no_return(self, data: DataType, **filters) -> None:
+        await super().update_no_return(data, **filters)
+        if "id" in filters:
+            await self.invalidate(user_id=filters["id"])
+        else:
+            await self.invalidate_all()
+
+    async def delete(self, **filters) -> None:
+        await super().delete(**filters)
+        if "id" in filters:
+            await self.invalidate(user_id=filters["id"])
+        else:
+            await self.invalidate_all()
+
+    async def update_many(self, data: Sequence[dict], **kwargs) -> None:
+        await super().update_many(data, **kwargs)
+        await self.invalidate_all()
+
+    async def delete_many(self, ids: Sequence[int], **kwargs) -> int:
+        deleted = await super().delete_many(ids, **kwargs)
+        await self.invalidate_all()
+        return deleted
+
+    async def invalidate(self, user_id: int, email: str | None = None) -> None:
+        """
+        Drop the cached row now, then once the surrounding transaction
+        commits drop it again and broadcast the change to other workers, so
+        nobody can re-cache the pre-commit row for a whole TTL.
+        """
+        await self._cache.invalidate(user_id=user_id, email=email)
+
+        pending = self._pending_invalidations()
+        pending[user_id] = pending.get(user_id) or email
+
+    async def invalidate_all(self) -> None:
+        """
+        Bulk variant of :meth:`invalidate`: clears the whole cache and, after
+        commit, broadcasts a single ``users_flushed`` event instead of one
+        ``user_updated`` per row.
+        """
+        await self._cache.clear()
+
+        self._pending_invalidations()
+        self._session.info["user_cache_flush"] = True
+
+    def _pending_invalidations(self) -> dict[int, str | None]:
+        info = self._session.info
+        if "user_cache_pending" not in info:
+            info["user_cache_pending"] = {}
+            event.listen(
+                self._session.sync_session,
+                "after_commit",
+                self._schedule_after_commit,
+                once=True,
+            )
+        return info["user_cache_pending"]
+
+    def _schedule_after_commit(self, session) -> None:
+        pending = session.info.pop("user_cache_pending", {})
+        flush = session.info.pop("user_cache_flush", False)
+        task = asyncio.get_running_loop().create_task(
+            self._after_commit(pending, flush)
+        )
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    async def _after_commit(self, pending: dict[int, str | None], flush: bool) -> None:
+        if flush:
+            await self._cache.clear()
+            await publish_auth_event(
+                AuthEventPayloadBroker(event=AuthEventTypeEnum.users_flushed)
+            )
+            return
+
+        for user_id, email in pending.items():
+            await self._cache.invalidate(user_id=user_id, email=email)
+            await publish_auth_event(
+                AuthEventPayloadBroker(
+                    event=AuthEventTypeEnum.user_updated,
+                    user_id=user_id,
+                    email=email,
+                )
+            )
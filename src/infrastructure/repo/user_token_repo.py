@@ -1,15 +1,34 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import exists, func, select
+from datetime import timedelta
 from infrastructure import UserToken
-from infrastructure.repo.base_sqlalchemy_repo import BaseSqlalchemyRepo
-from sqlalchemy import delete, func
+from infrastructure.repo.base_sqlalchemy_repo import (
+    BaseSqlalchemyRepo,
+    ExpiringRepoMixin,
+)
+from schemas.base_schemas import TokenTypeEnum
 
 
-class UserTokenRepository(BaseSqlalchemyRepo[UserToken]):
+class UserTokenRepository(ExpiringRepoMixin, BaseSqlalchemyRepo[UserToken]):
     def __init__(self, session: AsyncSession):
         super().__init__(UserToken, session)
 
-    async def delete_expired_tokens(self):
-        await self._session.execute(
-            delete(self._model).where(self._model.expires_at < func.now())
+    async def has_recent(
+        self, user_id: int, token_type: TokenTypeEnum, within: timedelta
+    ) -> bool:
+        """
+        Whether a still valid token of ``token_type`` was issued to the user
+        in the last ``within``.
+        """
+        res = await self._session.execute(
+            select(
+                exists().where(
+                    self._model.user_id == user_id,
+                    self._model.token_type == token_type,
+                    self._model.created_at > func.now() - within,
+                    # lets the planner prune expired partitions
+                    self._model.expires_at > func.now(),
+                )
+            )
         )
-        await self._session.flush()
+        return res.scalar_one()
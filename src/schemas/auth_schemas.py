@@ -1,11 +1,16 @@
-from schemas.base_schemas import BaseSchema, TokenTypeEnum
+from schemas.base_schemas import (
+    AuthEventTypeEnum,
+    BaseSchema,
+    NormalizedEmail,
+    TokenTypeEnum,
+)
 from pydantic import Field, EmailStr
 from typing import Annotated
 from datetime import datetime
 
 
 class LoginSchema(BaseSchema):
-    email: Annotated[EmailStr, Field(description="Email address")]
+    email: Annotated[NormalizedEmail, Field(description="Email address")]
     password: Annotated[str, Field(description="Password")]
 
 
@@ -16,7 +21,9 @@ class TokenSchema(BaseSchema):
 
 
 class ResetPasswordRequestSchema(BaseSchema):
-    email: Annotated[EmailStr, Field(max_length=150, description="Email address")]
+    email: Annotated[
+        NormalizedEmail, Field(max_length=150, description="Email address")
+    ]
 
 
 class NewPasswordSchema(BaseSchema):
@@ -36,5 +43,12 @@ class ResetPasswordEmailPayloadBroker(BaseSchema):
     token: str
 
 
+class AuthEventPayloadBroker(BaseSchema):
+    event: AuthEventTypeEnum
+    user_id: int | None = None
+    email: EmailStr | str | None = None
+    jti: str | None = None
+
+
 class VerifyEmailToken(BaseSchema):
     token: str
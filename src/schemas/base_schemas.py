@@ -1,6 +1,33 @@
 from datetime import datetime
+from enum import StrEnum
+from typing import Annotated
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import AfterValidator, BaseModel, ConfigDict, EmailStr
+
+
+class UserRole(StrEnum):
+    user = "user"
+    admin = "admin"
+
+
+class TokenTypeEnum(StrEnum):
+    reset_password = "reset_password"
+    verify_email = "verify_email"
+
+
+class AuthEventTypeEnum(StrEnum):
+    user_updated = "user_updated"
+    users_flushed = "users_flushed"
+    logout = "logout"
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+# emails are stored and looked up lower-cased, so the case-sensitive column
+# comparison and the user cache agree
+NormalizedEmail = Annotated[EmailStr, AfterValidator(normalize_email)]
 
 
 class BaseSchema(BaseModel):
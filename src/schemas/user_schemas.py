@@ -1,4 +1,4 @@
-from schemas.base_schemas import BaseSchema, BaseReadSchema, UserRole
+from schemas.base_schemas import BaseSchema, BaseReadSchema, NormalizedEmail, UserRole
 import re
 from pydantic import Field, field_validator, EmailStr
 from typing import Annotated, Optional
@@ -12,7 +12,8 @@ class RegisterUserSchema(BaseSchema):
         Optional[str], Field(max_length=50, min_length=3, description="First name")
     ] = None
     email: Annotated[
-        EmailStr, Field(max_length=50, min_length=7, description="Email address")
+        NormalizedEmail,
+        Field(max_length=50, min_length=7, description="Email address"),
     ]
     phone_number: Annotated[
         Optional[str], Field(max_length=15, min_length=7, description="Phone number")
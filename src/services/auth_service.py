@@ -1,41 +1,70 @@
-from schemas.user_schemas import UpdateUserPassSchema
+from dto.auth_dto import (
+    CreateRefreshTokenDTO,
+    CreateRevokedTokenDTO,
+    CreateUserTokenDTO,
+    TokenPrincipal,
+)
+from schemas.base_schemas import TokenTypeEnum, AuthEventTypeEnum
 from datetime import datetime, timedelta, timezone
-from typing import AsyncGenerator, Annotated
+from typing import Annotated
 from core import settings, Security
-from fastapi import Depends, Form
+from fastapi import Depends, Form, HTTPException, status
 from infrastructure import (
-    PasswordResetTokenRepository,
-    TokenRepository,
+    RefreshTokenRepository,
+    RevokedTokenRepository,
+    OutboxRepository,
+    UserTokenRepository,
     UserRepository,
     RefreshToken,
-    db_helper,
-    broker,
+    publish_auth_event,
+    get_unit_of_work,
+    UnitOfWork,
     User,
 )
+from infrastructure.cache import revocation_list
+from services.outbox_relay import outbox_message, outbox_relay
+from services.login_throttle import LoginAttempt, check_login_throttle, login_throttle
+from infrastructure.cache import InMemoryTTLCache
 from schemas import auth_schemas
 from core import exceptions
 import uuid
 
+# users who got a reset email within the coalescing window, per worker
+recent_reset_requests = InMemoryTTLCache(
+    max_size=settings.jwt.reset_request_coalesce_max_entries,
+    ttl=settings.jwt.reset_request_coalesce_seconds,
+)
+
 
 class AuthService:
     def __init__(
         self,
-        refresh_token_repo: TokenRepository,
+        refresh_token_repo: RefreshTokenRepository,
         user_repo: UserRepository,
-        reset_token_repo: PasswordResetTokenRepository,
+        user_token_repo: UserTokenRepository,
+        revoked_token_repo: RevokedTokenRepository,
+        outbox_repo: OutboxRepository,
+        uow: UnitOfWork,
     ):
-        self._token_repo: TokenRepository = refresh_token_repo
+        self._uow: UnitOfWork = uow
+        self._token_repo: RefreshTokenRepository = refresh_token_repo
         self._user_repo: UserRepository = user_repo
-        self._reset_token_repo: PasswordResetTokenRepository = reset_token_repo
+        self._user_token_repo: UserTokenRepository = user_token_repo
+        self._revoked_token_repo: RevokedTokenRepository = revoked_token_repo
+        self._outbox_repo: OutboxRepository = outbox_repo
 
     async def authenticate_user(
         self,
         user_data: Annotated[auth_schemas.LoginSchema, Form()],
     ) -> User:
-        if not (user := await self._user_repo.find_single(email=user_data.email)):
+        user = await self._user_repo.find_single(email=user_data.email)
+        # release the connection before password hashing
+        await self._uow.commit()
+
+        if not user:
             raise exceptions.unauthorized_exc_incorrect()
 
-        if not Security.verify_password(
+        if not await Security.verify_password_async(
             user_data.password,
             str(user.hashed_password),
         ):
@@ -44,9 +73,34 @@ class AuthService:
         if not user.is_active:
             raise exceptions.forbidden_exc_inactive()
 
+        if Security.password_needs_rehash(user.hashed_password):
+            await self._upgrade_password_hash(user, user_data.password)
+
         return user
 
-    async def login_user(self, user_data: User) -> auth_schemas.TokenSchema:
+    async def _upgrade_password_hash(self, user: User, password: str) -> None:
+        """
+        Re-hash with the current scheme and cost while the plain password is
+        at hand. Best effort: a busy hashing pool just defers it to the next
+        login.
+        """
+        try:
+            new_hashed_password = await Security.hash_password_async(password)
+        except exceptions.ServiceBusyError:
+            return
+        # only replaces the hash that was verified, so a password change
+        # committed meanwhile is never overwritten with the old password
+        await self._user_repo.replace_password_hash(
+            user_id=user.id,
+            old_hashed_password=user.hashed_password,
+            new_hashed_password=new_hashed_password,
+        )
+        await self._uow.commit()
+
+    @staticmethod
+    def _issue_tokens(
+        user_data: User,
+    ) -> tuple[auth_schemas.TokenSchema, CreateRefreshTokenDTO]:
         refresh_token_jti = str(uuid.uuid4())
         expire = datetime.now(timezone.utc) + timedelta(
             days=settings.jwt.refresh_expire_day
@@ -57,37 +111,74 @@ class AuthService:
             data=user_data, jti=refresh_token_jti, refresh_exp=expire
         )
 
-        await self._token_repo.create(
-            auth_schemas.CreateRefreshTokenSchema(
-                user_id=user_data.id,
-                jti=refresh_token_jti,
-                expires_at=datetime.now(timezone.utc)
-                + timedelta(days=settings.jwt.refresh_expire_day),
-            )
-        )
-
-        return auth_schemas.TokenSchema(
+        tokens = auth_schemas.TokenSchema(
             access_token=access_token,
             refresh_token=refresh_token,
         )
+        refresh_row = CreateRefreshTokenDTO(
+            user_id=user_data.id,
+            jti=refresh_token_jti,
+            expires_at=expire,
+        )
+        return tokens, refresh_row
+
+    async def login_user(self, user_data: User) -> auth_schemas.TokenSchema:
+        tokens, refresh_row = self._issue_tokens(user_data)
+
+        await self._token_repo.create_no_return(refresh_row)
+        await self._uow.commit()
 
-    async def logout_user(self, user_id: int, refresh_token: str) -> None:
+        return tokens
+
+    async def logout_user(self, principal: TokenPrincipal, refresh_token: str) -> None:
 
         payload = Security.decode_token(token=refresh_token)
 
-        token = await self.get_token(user_id=user_id, jti=payload["jti"])
+        token = await self.get_token(user_id=principal.id, jti=payload["jti"])
 
         # delete token for a specific session
         await self._token_repo.delete(id=token.id)
+        await self._stage_access_token_revocation(
+            user_id=principal.id, jti=principal.jti, exp=principal.exp
+        )
+        await self._uow.commit()
+
+        await self._announce_revocation(
+            event=AuthEventTypeEnum.logout, user_id=principal.id, jti=principal.jti
+        )
+
+    async def _stage_access_token_revocation(
+        self, user_id: int, jti: str, exp: int
+    ) -> None:
+        await self._revoked_token_repo.revoke(
+            CreateRevokedTokenDTO(
+                user_id=user_id,
+                jti=jti,
+                expires_at=datetime.fromtimestamp(exp, timezone.utc),
+            )
+        )
+
+    @staticmethod
+    async def _announce_revocation(
+        event: AuthEventTypeEnum, user_id: int, jti: str
+    ) -> None:
+        # this worker sees it immediately, the others through the fanout
+        revocation_list.add(jti)
+        await publish_auth_event(
+            auth_schemas.AuthEventPayloadBroker(event=event, user_id=user_id, jti=jti)
+        )
 
     async def update_refresh_token(
         self, user_data: User, jti: str
     ) -> auth_schemas.TokenSchema:
-        token = await self.get_token(user_id=user_data.id, jti=jti)
+        tokens, refresh_row = self._issue_tokens(user_data)
 
-        await self._token_repo.delete(id=token.id)
+        # unknown, expired or already rotated jti: reject as reuse
+        if not await self._token_repo.rotate(old_jti=jti, new_token=refresh_row):
+            raise exceptions.unauthorized_exc_inactive_token()
+        await self._uow.commit()
 
-        return await self.login_user(user_data=user_data)
+        return tokens
 
     async def get_token(self, user_id: int, jti: str) -> RefreshToken:
         if not (
@@ -100,96 +191,150 @@ class AuthService:
 
         if token.expires_at < datetime.now(timezone.utc):
             await self._token_repo.delete(id=token.id)
+            await self._uow.commit()
             raise exceptions.unauthorized_exc_inactive_token()
         return token
 
     async def create_reset_token(self, email: str) -> None:
-        if not (user := await self._user_repo.find_single(email=email)):
+        """
+        Issue a reset token and queue its email, unless one was issued to
+        the same user within ``jwt.reset_request_coalesce_seconds``.
+        """
+        user = await self._user_repo.find_single(email=email)
+
+        if not user:
+            await self._uow.commit()
+            return
+
+        key = f"reset:{user.id}"
+        if await recent_reset_requests.get(key) is not None:
+            await self._uow.commit()
+            return
+        # claimed before any await that could yield to a concurrent request
+        await recent_reset_requests.set(key, True)
+
+        try:
+            await self._create_reset_token(user)
+        except Exception:
+            await recent_reset_requests.delete(key)
+            raise
+
+    async def _create_reset_token(self, user: User) -> None:
+        window = settings.jwt.reset_request_coalesce_seconds
+        # another worker may have issued one within the window
+        if window and await self._user_token_repo.has_recent(
+            user_id=user.id,
+            token_type=TokenTypeEnum.reset_password,
+            within=timedelta(seconds=window),
+        ):
+            await self._uow.commit()
             return
 
         raw_token = Security.generate_reset_token()
 
         lookup_hash = Security.hash_token_sha256(token=raw_token)
-        hashed_token = Security.hash_password(raw_token)
+        hashed_token = Security.hash_token_hmac(raw_token)
         expire_at = datetime.now(timezone.utc) + timedelta(
             minutes=settings.jwt.reset_token_expire_minute
         )
 
-        await self._reset_token_repo.create(
-            auth_schemas.CreateResetPasswordTokenSchema(
+        await self._user_token_repo.create_no_return(
+            CreateUserTokenDTO(
                 user_id=user.id,
                 lookup_hash=lookup_hash,
                 hashed_token=hashed_token,
                 expires_at=expire_at,
+                token_type=TokenTypeEnum.reset_password,
             )
         )
-
-        await broker.publish(
-            auth_schemas.ResetPasswordEmailPayloadBroker(
-                email=user.email,
-                token=raw_token,
-            ),
-            queue="password-reset-request",
+        # committed together with the token, relayed to the broker later
+        await self._outbox_repo.create_no_return(
+            outbox_message(
+                auth_schemas.ResetPasswordEmailPayloadBroker(
+                    email=user.email,
+                    token=raw_token,
+                ),
+                queue="password-reset-request",
+            )
         )
+        await self._uow.commit()
+        outbox_relay.wake()
 
     async def reset_password(
         self, data: auth_schemas.ResetPasswordConfirmSchema
     ) -> None:
         lookup_hash = Security.hash_token_sha256(token=data.token)
 
-        reset_token = await self._reset_token_repo.find_single(lookup_hash=lookup_hash)
+        reset_token = await self._user_token_repo.find_single(
+            lookup_hash=lookup_hash,
+            token_type=TokenTypeEnum.reset_password,
+        )
 
         if not reset_token:
             raise exceptions.unauthorized_exc_inactive_token()
 
         if reset_token.expires_at < datetime.now(timezone.utc):
-            await self._reset_token_repo.delete(id=reset_token.id)
+            await self._user_token_repo.delete(id=reset_token.id)
+            await self._uow.commit()
             raise exceptions.unauthorized_exc_inactive_token()
 
-        if not Security.verify_password(data.token, reset_token.hashed_token):
+        user = await self._user_repo.find_single(id=reset_token.user_id)
+        await self._uow.commit()
+
+        if not await Security.verify_token_digest(data.token, reset_token.hashed_token):
             raise exceptions.unauthorized_exc_incorrect()
 
-        if not (user := await self._user_repo.find_single(id=reset_token.user_id)):
+        if not user:
             raise exceptions.unauthorized_exc_inactive_token()
 
-        await self._reset_token_repo.delete(id=reset_token.id)
         await self.update_user_password(user_id=user.id, new_password=data.new_password)
+        await self._user_token_repo.delete(id=reset_token.id)
+        await self._uow.commit()
 
     async def change_password(
         self, data: auth_schemas.ChangePasswordSchema, user: User
     ) -> None:
-        if not Security.verify_password(data.old_password, user.hashed_password):
+        if not await Security.verify_password_async(
+            data.old_password, user.hashed_password
+        ):
             raise exceptions.incorrect_old_password()
 
+        # also logs the user out everywhere
         await self.update_user_password(user_id=user.id, new_password=data.new_password)
-
-        # full logout user
-        await self._token_repo.delete(user_id=user.id)
+        await self._uow.commit()
 
     async def update_user_password(self, user_id: int, new_password: str) -> None:
-        new_hashed_password = Security.hash_password(password=new_password)
-        await self._user_repo.update(
-            UpdateUserPassSchema(
-                hashed_password=new_hashed_password,
-            ),
-            id=user_id,
+        # hash before touching the DB so no connection is held while hashing
+        new_hashed_password = await Security.hash_password_async(password=new_password)
+        await self._user_repo.set_password(
+            user_id=user_id, hashed_password=new_hashed_password
         )
 
 
-async def get_auth_service() -> AsyncGenerator[AuthService, None]:
-    async with db_helper.get_session() as session:
-        token_repo = TokenRepository(session)
-        user_repo = UserRepository(session)
-        reset_token = PasswordResetTokenRepository(session)
-        yield AuthService(
-            refresh_token_repo=token_repo,
-            user_repo=user_repo,
-            reset_token_repo=reset_token,
-        )
+async def get_auth_service(
+    uow: Annotated[UnitOfWork, Depends(get_unit_of_work)],
+) -> AuthService:
+    return AuthService(
+        refresh_token_repo=RefreshTokenRepository(uow.session),
+        user_repo=UserRepository(uow.session),
+        user_token_repo=UserTokenRepository(uow.session),
+        revoked_token_repo=RevokedTokenRepository(uow.session),
+        outbox_repo=OutboxRepository(uow.session),
+        uow=uow,
+    )
 
 
 async def authenticate_user_dependency(
+    # resolved first: throttled attempts never reach the DB or the hasher
+    attempt: Annotated[LoginAttempt, Depends(check_login_throttle)],
     user_data: Annotated[auth_schemas.LoginSchema, Form()],
     auth_service: Annotated["AuthService", Depends(get_auth_service)],
 ):
-    return await auth_service.authenticate_user(user_data=user_data)
+    try:
+        user = await auth_service.authenticate_user(user_data=user_data)
+    except HTTPException as exc:
+        if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+            await login_throttle.record_failure(attempt)
+        raise
+    await login_throttle.record_success(attempt)
+    return user
@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+from typing import Annotated
+from fastapi import Depends, Form, Request
+from core import settings
+from core.exceptions import TooManyRequestsError
+from infrastructure.cache.rate_limit import InMemoryRateLimitBackend, RateLimitBackend
+from schemas import auth_schemas
+import math
+
+
+@dataclass(slots=True, frozen=True)
+class LoginAttempt:
+    ip: str
+    email: str
+
+    @property
+    def keys(self) -> dict[str, str]:
+        return {
+            "ip": f"login:ip:{self.ip}",
+            "email": f"login:email:{self.email}",
+            "pair": f"login:pair:{self.ip}:{self.email}",
+        }
+
+
+class LoginThrottle:
+    """
+    Sliding-window limit on failed logins per IP, per email and per
+    IP+email pair. Checked before any DB lookup or password hashing; a
+    successful login clears the email and pair counters.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        *,
+        window: float,
+        limits: dict[str, int],
+        enabled: bool = True,
+    ) -> None:
+        self._backend = backend
+        self._window = window
+        self._limits = limits
+        self.enabled = enabled
+        self.rejected = 0
+
+    def _retry_after(self, previous: int, current: int, elapsed: float, limit: int):
+        """
+        Seconds until ``previous * (1 - elapsed / window) + current`` drops
+        below ``limit``.
+        """
+        window = self._window
+        if current >= limit:
+            # only once the current window has rolled over and partly aged out
+            wait = (window - elapsed) + window * (1 - limit / current)
+        else:
+            wait = window * (1 - (limit - current) / previous) - elapsed
+        return max(1, math.ceil(wait))
+
+    async def check(self, attempt: LoginAttempt) -> None:
+        if not self.enabled:
+            return
+
+        retry_after = 0
+        for scope, key in attempt.keys.items():
+            limit = self._limits[scope]
+            previous, current, elapsed = await self._backend.get(key, self._window)
+            weighted = previous * (1 - elapsed / self._window) + current
+            if weighted >= limit:
+                retry_after = max(
+                    retry_after,
+                    self._retry_after(previous, current, elapsed, limit),
+                )
+
+        if retry_after:
+            self.rejected += 1
+            raise TooManyRequestsError(retry_after=retry_after)
+
+    async def record_failure(self, attempt: LoginAttempt) -> None:
+        if not self.enabled:
+            return
+        for key in attempt.keys.values():
+            await self._backend.incr(key, self._window)
+
+    async def record_success(self, attempt: LoginAttempt) -> None:
+        if not self.enabled:
+            return
+        keys = attempt.keys
+        await self._backend.delete(keys["email"], keys["pair"])
+
+    @property
+    def stats(self) -> dict:
+        return {"rejected": self.rejected, **self._backend.stats}
+
+
+login_throttle = LoginThrottle(
+    InMemoryRateLimitBackend(max_keys=settings.throttle.max_keys),
+    window=settings.throttle.window_seconds,
+    limits={
+        "ip": settings.throttle.max_failures_per_ip,
+        "email": settings.throttle.max_failures_per_email,
+        "pair": settings.throttle.max_failures_per_pair,
+    },
+    enabled=settings.throttle.enabled,
+)
+
+
+def client_ip(request: Request) -> str:
+    """
+    Entries left of those our own proxies appended are client-supplied and
+    can be anything, so count ``trusted_proxy_hops`` from the right.
+    """
+    hops = settings.throttle.trusted_proxy_hops
+    if hops and (forwarded := request.headers.get("x-forwarded-for")):
+        entries = [entry.strip() for entry in forwarded.split(",")]
+        if len(entries) >= hops:
+            return entries[-hops]
+    return request.client.host if request.client else "unknown"
+
+
+async def check_login_throttle(
+    request: Request,
+    user_data: Annotated[auth_schemas.LoginSchema, Form()],
+) -> LoginAttempt:
+    attempt = LoginAttempt(ip=client_ip(request), email=user_data.email.lower())
+    await login_throttle.check(attempt)
+    return attempt
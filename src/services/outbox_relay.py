@@ -0,0 +1,227 @@
+from collections import defaultdict
+from cryptography.fernet import Fernet
+from datetime import timedelta
+from core import settings
+from dto.outbox_dto import CreateOutboxMessageDTO
+from infrastructure import OutboxRepository, db_helper, publisher
+from infrastructure.broker.publisher import BatchPublisher, OutgoingMessage
+from pydantic import BaseModel
+import asyncio
+import base64
+import hmac
+import logging
+import orjson
+import time
+
+log = logging.getLogger(__name__)
+
+ENCRYPTED_PAYLOAD_KEY = "fernet"
+# payloads may carry secrets such as raw reset tokens, never store them in clear
+payload_cipher = Fernet(
+    settings.outbox.payload_key
+    or base64.urlsafe_b64encode(
+        hmac.digest(settings.jwt.secret_key.encode(), b"outbox-payload", "sha256")
+    )
+)
+
+
+def outbox_message(
+    message: BaseModel, queue: str = "", exchange: str | None = None
+) -> CreateOutboxMessageDTO:
+    return CreateOutboxMessageDTO(
+        payload={
+            ENCRYPTED_PAYLOAD_KEY: payload_cipher.encrypt(
+                orjson.dumps(message.model_dump(mode="json"))
+            ).decode()
+        },
+        queue=queue,
+        exchange=exchange,
+    )
+
+
+def decrypt_payload(payload: dict) -> dict:
+    if ENCRYPTED_PAYLOAD_KEY not in payload:
+        # written before payloads were encrypted
+        return payload
+    return orjson.loads(payload_cipher.decrypt(payload[ENCRYPTED_PAYLOAD_KEY]))
+
+
+class OutboxRelay:
+    """
+    Streams committed ``outbox_messages`` rows to RabbitMQ.
+
+    Each relay task locks a batch with ``FOR UPDATE SKIP LOCKED``, publishes
+    it with confirms and, in the same transaction, deletes the confirmed rows
+    and pushes failed ones back with an exponential per-row backoff. Rows that
+    fail ``max_attempts`` times are dropped. Several relays, in this process
+    or others, never pick the same row.
+    """
+
+    def __init__(
+        self,
+        *,
+        relays: int,
+        batch_size: int,
+        poll_interval: float,
+        retry_base: float,
+        retry_max: float,
+        max_attempts: int,
+        publisher: BatchPublisher,
+        backlog_refresh: float = 15.0,
+    ) -> None:
+        self._relays = relays
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._retry_base = retry_base
+        self._retry_max = retry_max
+        self._max_attempts = max_attempts
+        self._backlog_refresh = backlog_refresh
+        self._backlog_checked_at = 0.0
+        self.pending = 0
+        self.oldest_age_seconds = 0.0
+        self._publisher = publisher
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self.relayed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.undecryptable = 0
+        self.batches = 0
+        self.errors = 0
+
+    def _delay(self, attempts: int) -> float:
+        return min(self._retry_base * 2**attempts, self._retry_max)
+
+    async def relay_batch(self) -> int:
+        async with db_helper.get_session() as session:
+            repo = OutboxRepository(session)
+            rows = await repo.claim_batch(self._batch_size)
+            if not rows:
+                return 0
+
+            # a row that cannot be decrypted (rotated key, corrupt payload)
+            # goes through the failed path instead of blocking the batch
+            items: list[OutgoingMessage | None] = []
+            for row in rows:
+                try:
+                    message = decrypt_payload(row.payload)
+                except Exception:
+                    self.undecryptable += 1
+                    log.exception("Cannot decrypt outbox message %s", row.id)
+                    items.append(None)
+                    continue
+                items.append(
+                    OutgoingMessage(
+                        message=message, queue=row.queue, exchange=row.exchange
+                    )
+                )
+            readable = [item for item in items if item is not None]
+            failed = {id(item) for item in await self._publisher.flush(readable)}
+
+            sent_ids = []
+            dropped_ids = []
+            retry_ids: dict[int, list[int]] = defaultdict(list)
+            for row, item in zip(rows, items):
+                if item is not None and id(item) not in failed:
+                    sent_ids.append(row.id)
+                elif row.attempts + 1 >= self._max_attempts:
+                    dropped_ids.append(row.id)
+                else:
+                    retry_ids[row.attempts].append(row.id)
+
+            if dropped_ids:
+                log.error(
+                    "Dropping outbox messages %s after %d attempts",
+                    dropped_ids,
+                    self._max_attempts,
+                )
+            await repo.delete_many(sent_ids + dropped_ids)
+            for attempts, ids in retry_ids.items():
+                await repo.reschedule(ids, timedelta(seconds=self._delay(attempts)))
+
+        self.batches += 1
+        self.relayed += len(sent_ids)
+        self.failed += len(rows) - len(sent_ids)
+        self.dropped += len(dropped_ids)
+        return len(rows)
+
+    async def refresh_backlog(self) -> None:
+        """
+        Re-read the backlog at most every ``backlog_refresh`` seconds, shared
+        by all relay tasks, so /metrics never queries the table itself.
+        """
+        now = time.monotonic()
+        if now - self._backlog_checked_at < self._backlog_refresh:
+            return
+        self._backlog_checked_at = now
+        async with db_helper.get_session() as session:
+            self.pending, self.oldest_age_seconds = await OutboxRepository(
+                session
+            ).backlog()
+
+    def wake(self) -> None:
+        """
+        Let an idle relay pick up a freshly committed message right away.
+        """
+        self._wakeup.set()
+
+    async def _idle(self) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _run_forever(self) -> None:
+        errors = 0
+        while True:
+            try:
+                relayed = await self.relay_batch()
+                await self.refresh_backlog()
+                errors = 0
+            except Exception:
+                errors += 1
+                self.errors += 1
+                log.exception("Outbox relay failed")
+                await asyncio.sleep(self._delay(errors))
+                continue
+            if relayed < self._batch_size:
+                await self._idle()
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._run_forever()) for _ in range(self._relays)
+            ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "relays": len(self._tasks),
+            "pending": self.pending,
+            "oldest_age_seconds": round(self.oldest_age_seconds, 3),
+            "relayed": self.relayed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "undecryptable": self.undecryptable,
+            "batches": self.batches,
+            "errors": self.errors,
+        }
+
+
+outbox_relay = OutboxRelay(
+    relays=settings.outbox.relays,
+    batch_size=settings.outbox.batch_size,
+    poll_interval=settings.outbox.poll_interval_seconds,
+    retry_base=settings.outbox.retry_base_seconds,
+    retry_max=settings.outbox.retry_max_seconds,
+    max_attempts=settings.outbox.max_attempts,
+    backlog_refresh=settings.outbox.backlog_refresh_seconds,
+    publisher=publisher,
+)
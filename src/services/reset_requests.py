@@ -0,0 +1,123 @@
+from core import settings
+from infrastructure import (
+    OutboxRepository,
+    RefreshTokenRepository,
+    RevokedTokenRepository,
+    UnitOfWork,
+    UserRepository,
+    UserTokenRepository,
+    db_helper,
+)
+from services.auth_service import AuthService
+import asyncio
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class ResetRequestIssuer:
+    """
+    Issues password-reset tokens off the request path.
+
+    The endpoint only enqueues the email and answers 202, so it takes the
+    same time whether the email is unknown, coalesced or gets a token. A
+    fixed number of workers drain the queue, so at most ``workers`` DB
+    connections are used for this per process.
+
+    Accepted requests are lost when the queue already holds ``max_pending``
+    emails or when they are still pending at shutdown; both are counted in
+    ``stats`` and the caller can simply ask again.
+    """
+
+    def __init__(self, *, workers: int, max_pending: int) -> None:
+        self._workers = workers
+        self._queue: asyncio.Queue[str] = asyncio.Queue(max_pending)
+        self._tasks: list[asyncio.Task] = []
+        self.submitted = 0
+        self.issued = 0
+        self.errors = 0
+        self.lost_queue_full = 0
+        self.lost_on_shutdown = 0
+
+    def submit(self, email: str) -> None:
+        try:
+            self._queue.put_nowait(email)
+        except asyncio.QueueFull:
+            self.lost_queue_full += 1
+            log.warning("Reset request queue is full, request lost")
+            return
+        self.submitted += 1
+
+    async def _issue(self, email: str) -> None:
+        async with db_helper.get_session() as session:
+            await AuthService(
+                refresh_token_repo=RefreshTokenRepository(session),
+                user_repo=UserRepository(session),
+                user_token_repo=UserTokenRepository(session),
+                revoked_token_repo=RevokedTokenRepository(session),
+                outbox_repo=OutboxRepository(session),
+                uow=UnitOfWork(session),
+            ).create_reset_token(email)
+
+    async def _run_forever(self) -> None:
+        while True:
+            email = await self._queue.get()
+            try:
+                await self._issue(email)
+            except asyncio.CancelledError:
+                self.lost_on_shutdown += 1
+                raise
+            except Exception:
+                self.errors += 1
+                log.exception("Issuing a reset token failed")
+            else:
+                self.issued += 1
+            finally:
+                self._queue.task_done()
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._run_forever()) for _ in range(self._workers)
+            ]
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """
+        Give queued requests ``timeout`` seconds to finish, then cancel the
+        workers; whatever is left is counted as lost.
+        """
+        if self._tasks:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self.lost_on_shutdown += 1
+        if self.lost_on_shutdown:
+            log.warning("%d reset requests lost on shutdown", self.lost_on_shutdown)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "pending": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "submitted": self.submitted,
+            "issued": self.issued,
+            "errors": self.errors,
+            "lost_queue_full": self.lost_queue_full,
+            "lost_on_shutdown": self.lost_on_shutdown,
+        }
+
+
+reset_request_issuer = ResetRequestIssuer(
+    workers=settings.jwt.reset_request_workers,
+    max_pending=settings.jwt.reset_request_max_pending,
+)
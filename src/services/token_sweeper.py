@@ -0,0 +1,133 @@
+from typing import Callable
+from core import settings
+from infrastructure import (
+    RefreshTokenRepository,
+    RevokedTokenRepository,
+    UserTokenRepository,
+    db_helper,
+)
+from infrastructure.repo.base_sqlalchemy_repo import ExpiringRepoMixin
+from infrastructure.db.partitions import maintain_partitions
+from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import logging
+import random
+
+log = logging.getLogger(__name__)
+
+
+class ExpiredTokenSweeper:
+    """
+    Periodically drops expired token partitions, pre-creates future ones and
+    deletes the remaining expired refresh, user (reset/verification) and
+    revoked access tokens in small batches, one short transaction per batch.
+    """
+
+    repositories: dict[str, Callable[[AsyncSession], ExpiringRepoMixin]] = {
+        "refresh_tokens": RefreshTokenRepository,
+        "user_tokens": UserTokenRepository,
+        "revoked_tokens": RevokedTokenRepository,
+    }
+
+    def __init__(
+        self,
+        *,
+        interval: float,
+        jitter: float,
+        batch_size: int,
+        batch_pause: float,
+        manage_partitions: bool = False,
+        partition_days_ahead: int = 14,
+    ) -> None:
+        self._interval = interval
+        self._jitter = jitter
+        self._batch_size = batch_size
+        self._batch_pause = batch_pause
+        self._manage_partitions = manage_partitions
+        self._partition_days_ahead = partition_days_ahead
+        self._task: asyncio.Task | None = None
+        self.runs = 0
+        self.last_run: dict[str, int] = {}
+        self.total_deleted: dict[str, int] = dict.fromkeys(self.repositories, 0)
+
+    async def _delete_batch(
+        self, repo_factory: Callable[[AsyncSession], ExpiringRepoMixin]
+    ) -> int:
+        async with db_helper.get_session() as session:
+            return await repo_factory(session).delete_expired(
+                batch_size=self._batch_size
+            )
+
+    async def _sweep_table(
+        self, repo_factory: Callable[[AsyncSession], ExpiringRepoMixin]
+    ) -> int:
+        deleted = 0
+        while True:
+            batch = await self._delete_batch(repo_factory)
+            deleted += batch
+            if batch < self._batch_size:
+                return deleted
+            await asyncio.sleep(self._batch_pause)
+
+    async def run_once(self) -> dict[str, int]:
+        if self._manage_partitions:
+            await maintain_partitions(days_ahead=self._partition_days_ahead)
+
+        # tokens that expired earlier today still live in a partition that
+        # cannot be dropped yet
+        result = {}
+        for table, repo_factory in self.repositories.items():
+            result[table] = await self._sweep_table(repo_factory)
+            self.total_deleted[table] += result[table]
+
+        self.runs += 1
+        self.last_run = result
+        log.info("Expired token sweep removed %s", result)
+        return result
+
+    async def _run_forever(self) -> None:
+        # partitions for new tokens must exist before the first sleep, inserts
+        # past the last one fail
+        if self._manage_partitions:
+            try:
+                await maintain_partitions(days_ahead=self._partition_days_ahead)
+            except Exception:
+                log.exception("Partition maintenance failed")
+        while True:
+            await asyncio.sleep(self._interval + random.uniform(0, self._jitter))
+            try:
+                await self.run_once()
+            except Exception:
+                log.exception("Expired token sweep failed")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "last_run": self.last_run,
+            "total_deleted": self.total_deleted,
+        }
+
+
+token_sweeper = ExpiredTokenSweeper(
+    interval=settings.sweeper.interval_seconds,
+    jitter=settings.sweeper.jitter_seconds,
+    batch_size=settings.sweeper.batch_size,
+    batch_pause=settings.sweeper.batch_pause_seconds,
+    manage_partitions=settings.sweeper.manage_partitions,
+    partition_days_ahead=settings.sweeper.partition_days_ahead,
+)
@@ -1,18 +1,23 @@
 from dto.user_dto import CreateUserDTO
 from services.base_service import BaseService
-from infrastructure import UserRepository, db_helper, User
-from typing import AsyncGenerator
+from infrastructure import UserRepository, UnitOfWork, get_unit_of_work, User
+from typing import Annotated
+from fastapi import Depends
 from schemas.user_schemas import RegisterUserSchema, UserRole
 from core.exceptions import NotFoundError, AlreadyExistsError
 from core.security.security import Security
 
 
 class UserService(BaseService):
-    def __init__(self, user_repo: UserRepository):
+    def __init__(self, user_repo: UserRepository, uow: UnitOfWork):
         self._user_repo = user_repo
+        self._uow = uow
 
     async def add(self, user_data: RegisterUserSchema) -> User:
-        if await self._user_repo.find_single(email=user_data.email):
+        existing_user = await self._user_repo.find_single(email=user_data.email)
+        await self._uow.commit()
+
+        if existing_user:
             raise AlreadyExistsError("User already exists")
 
         new_user = CreateUserDTO(
@@ -21,9 +26,11 @@ class UserService(BaseService):
             email=user_data.email,
             phone_number=user_data.phone_number,
             role=UserRole.user.value,
-            hashed_password=Security.hash_password(user_data.password),
+            hashed_password=await Security.hash_password_async(user_data.password),
         )
-        return await self._user_repo.create(data=new_user)
+        user = await self._user_repo.create(data=new_user)
+        await self._uow.commit()
+        return user
 
     async def update(self, **kwargs):
         pass
@@ -36,11 +43,25 @@ class UserService(BaseService):
             raise NotFoundError("User not found")
         return user
 
-    async def get_all(self, **kwargs):
-        pass
+    async def get_token_version(self, user_id: int) -> int | None:
+        version = await self._user_repo.get_token_version(user_id)
+        # release the connection if the cache missed
+        await self._uow.commit()
+        return version
+
+    async def get_all(
+        self, after_id: int | None = None, limit: int = 100, **filters
+    ) -> list[User]:
+        users = await self._user_repo.find_many(
+            after_id=after_id,
+            limit=limit,
+            **filters,
+        )
+        await self._uow.commit()
+        return list(users)
 
 
-async def get_user_service() -> AsyncGenerator[UserService, None]:
-    async with db_helper.get_session() as session:
-        user_repo = UserRepository(session)
-        yield UserService(user_repo)
+async def get_user_service(
+    uow: Annotated[UnitOfWork, Depends(get_unit_of_work)],
+) -> UserService:
+    return UserService(UserRepository(uow.session), uow=uow)
@@ -0,0 +1,23 @@
+from faststream.rabbit import TestRabbitBroker
+
+from infrastructure import broker, publish_auth_event
+from infrastructure.cache import user_cache
+from schemas.auth_schemas import AuthEventPayloadBroker
+from schemas.base_schemas import AuthEventTypeEnum
+
+
+class TestAuthEvents:
+
+    async def test_user_updated_event_evicts_local_cache(self) -> None:
+        await user_cache.set({"id": 42, "email": "test42@example.com"})
+
+        async with TestRabbitBroker(broker):
+            await publish_auth_event(
+                AuthEventPayloadBroker(
+                    event=AuthEventTypeEnum.user_updated,
+                    user_id=42,
+                )
+            )
+
+        assert await user_cache.get_by_id(42) is None
+        assert await user_cache.get_by_email("test42@example.com") is None
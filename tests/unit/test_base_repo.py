@@ -0,0 +1,27 @@
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from infrastructure import RefreshToken
+from infrastructure.repo.base_sqlalchemy_repo import BaseSqlalchemyRepo
+
+repo = BaseSqlalchemyRepo(RefreshToken, session=None)
+
+
+def compile_where(**filters) -> str:
+    stmt = select(RefreshToken.id).where(*repo._filter(filters))
+    return str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+
+
+class TestBaseSqlalchemyRepo:
+
+    def test_scalar_filter_uses_equality(self) -> None:
+        assert "refresh_tokens.user_id = $1::INTEGER" in compile_where(user_id=1)
+
+    def test_sequence_filter_uses_single_any_array(self) -> None:
+        sql = compile_where(id=list(range(10_000)))
+
+        assert "refresh_tokens.id = ANY ($1::INTEGER[])" in sql
+        assert "$2" not in sql
+
+    def test_batches(self) -> None:
+        assert list(repo._batches([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
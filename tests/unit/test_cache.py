@@ -0,0 +1,175 @@
+import time
+
+from core.security.token_cache import VerifiedTokenCache
+from infrastructure.cache import (
+    BloomFilter,
+    InMemoryTTLCache,
+    RevocationList,
+    UserCache,
+)
+
+user_row = {"id": 1, "email": "test1@example.com", "hashed_password": "x"}
+
+
+class TestInMemoryTTLCache:
+
+    async def test_lru_eviction(self) -> None:
+        cache = InMemoryTTLCache(max_size=2, ttl=60)
+
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        assert await cache.get("a") == 1
+
+        await cache.set("c", 3)
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == 1
+        assert cache.stats["evictions"] == 1
+
+    async def test_ttl_expiry(self, monkeypatch) -> None:
+        cache = InMemoryTTLCache(max_size=10, ttl=5)
+        now = time.monotonic()
+
+        monkeypatch.setattr(time, "monotonic", lambda: now)
+        await cache.set("a", 1)
+        assert await cache.get("a") == 1
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+        assert await cache.get("a") is None
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+
+class TestUserCache:
+
+    async def test_lookup_by_id_and_email(self) -> None:
+        cache = UserCache(InMemoryTTLCache(max_size=10, ttl=60))
+        await cache.set(user_row)
+
+        assert await cache.get_by_id(1) == user_row
+        assert await cache.get_by_email("test1@example.com") == user_row
+
+    async def test_email_lookup_is_exact_and_counted_once(self) -> None:
+        cache = UserCache(InMemoryTTLCache(max_size=10, ttl=60))
+        await cache.set(user_row)
+
+        assert await cache.get_by_email("Test1@example.com") is None
+        assert await cache.get_by_email("test1@example.com") == user_row
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    async def test_invalidate_drops_both_keys(self) -> None:
+        cache = UserCache(InMemoryTTLCache(max_size=10, ttl=60))
+        await cache.set(user_row)
+
+        await cache.invalidate(user_id=1)
+
+        assert await cache.get_by_id(1) is None
+        assert await cache.get_by_email("test1@example.com") is None
+        assert cache.stats["size"] == 0
+
+
+class TestVerifiedTokenCache:
+
+    def test_hit_until_token_exp(self, monkeypatch) -> None:
+        cache = VerifiedTokenCache(max_entries=10, max_bytes=1 << 20)
+        now = time.time()
+        payload = {"sub": "1", "exp": int(now) + 10}
+
+        cache.set("token", payload)
+        assert cache.get("token") is payload
+        assert cache.get("other") is None
+
+        monkeypatch.setattr(time, "time", lambda: now + 11)
+        assert cache.get("token") is None
+        assert cache.stats["size"] == 0
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 2
+
+    def test_memory_cap_evicts_oldest(self) -> None:
+        exp = int(time.time()) + 60
+        probe = VerifiedTokenCache(max_entries=10, max_bytes=1 << 20)
+        probe.set("probe", {"sub": "1", "exp": exp})
+        entry_size = probe.stats["bytes"]
+
+        cache = VerifiedTokenCache(max_entries=10, max_bytes=entry_size * 2)
+        for token in ("a", "b", "c"):
+            cache.set(token, {"sub": "1", "exp": exp})
+
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+        assert cache.stats["bytes"] <= entry_size * 2
+        assert cache.stats["evictions"] == 1
+
+
+class TestBloomFilter:
+
+    def test_no_false_negatives(self) -> None:
+        bloom = BloomFilter.for_capacity(1000, 0.01)
+        jtis = [f"jti-{i}" for i in range(1000)]
+        for jti in jtis:
+            bloom.add(jti)
+
+        assert all(jti in bloom for jti in jtis)
+        false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+        assert false_positives < 300
+
+
+class TestRevocationList:
+
+    @staticmethod
+    def make(monkeypatch, revoked: set[str]) -> tuple[RevocationList, list[str]]:
+        revocations = RevocationList(
+            capacity=100, error_rate=0.001, rebuild_interval=60
+        )
+        store_lookups = []
+
+        async def is_revoked_in_store(jti: str) -> bool:
+            store_lookups.append(jti)
+            return jti in revoked
+
+        async def load_jtis() -> list[str]:
+            # a revocation arriving while the table is being read
+            revocations.add("late")
+            return sorted(revoked)
+
+        monkeypatch.setattr(revocations, "_is_revoked_in_store", is_revoked_in_store)
+        monkeypatch.setattr(revocations, "_load_jtis", load_jtis)
+        return revocations, store_lookups
+
+    async def test_store_is_used_until_first_build(self, monkeypatch) -> None:
+        revocations, store_lookups = self.make(monkeypatch, {"a"})
+
+        assert await revocations.is_revoked("a")
+        assert not await revocations.is_revoked("b")
+        assert store_lookups == ["a", "b"]
+
+    async def test_fast_path_after_rebuild(self, monkeypatch) -> None:
+        revocations, store_lookups = self.make(monkeypatch, {"a"})
+        await revocations.rebuild()
+
+        assert not await revocations.is_revoked("b")
+        assert await revocations.is_revoked("a")
+        assert revocations.might_be_revoked("late")
+        assert store_lookups == ["a"]
+        assert revocations.stats["fast_path"] == 1
+
+    async def test_fanout_echo_is_not_counted_twice(self, monkeypatch) -> None:
+        revocations, _ = self.make(monkeypatch, {"a"})
+        await revocations.rebuild()
+        items = revocations.stats["items"]
+
+        revocations.add("c")
+        revocations.add("c")
+
+        assert revocations.stats["items"] == items + 1
+
+    async def test_start_builds_before_returning(self, monkeypatch) -> None:
+        revocations, store_lookups = self.make(monkeypatch, {"a"})
+        await revocations.start()
+        try:
+            assert revocations.stats["ready"]
+            assert not await revocations.is_revoked("b")
+            assert store_lookups == []
+        finally:
+            await revocations.stop()
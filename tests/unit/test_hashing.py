@@ -0,0 +1,31 @@
+import asyncio
+import time
+
+import pytest
+from core.exceptions import ServiceBusyError
+from core.security import Security
+from core.security.hashing import HashingPool
+
+
+class TestHashingPool:
+
+    async def test_hash_and_verify_password_async(self) -> None:
+        hashed_password = await Security.hash_password_async("qwerty")
+
+        assert await Security.verify_password_async("qwerty", hashed_password) is True
+        assert await Security.verify_password_async("123456", hashed_password) is False
+
+    async def test_rejects_when_saturated(self) -> None:
+        pool = HashingPool(executor="thread", max_workers=1, max_queue_size=1)
+
+        first = asyncio.create_task(pool.run(time.sleep, 0.2))
+        second = asyncio.create_task(pool.run(time.sleep, 0.2))
+        await asyncio.sleep(0)
+
+        assert pool.in_flight == 2
+        with pytest.raises(ServiceBusyError):
+            await pool.run(time.sleep, 0)
+
+        await asyncio.gather(first, second)
+        assert pool.in_flight == 0
+        pool.shutdown()
@@ -0,0 +1,66 @@
+import time
+
+import pytest
+from jose import jwt, JWTError
+
+from core.security.jwt_codec import JWTCodec
+from core.security.keys import KeyRing
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose.utils import base64url_encode
+import orjson
+
+ring = KeyRing(algorithm="HS256", secret_key="secret")
+codec = JWTCodec(ring)
+
+
+class TestJWTCodec:
+
+    def test_round_trip_is_compatible_with_jose(self) -> None:
+        claims = {"sub": "1", "exp": int(time.time()) + 60}
+
+        token = codec.encode(claims)
+
+        assert jwt.decode(token, "secret", algorithms=["HS256"]) == claims
+        assert codec.decode(jwt.encode(claims, "secret", algorithm="HS256")) == claims
+
+    def test_expired_token_is_rejected(self) -> None:
+        token = codec.encode({"sub": "1", "exp": int(time.time()) - 1})
+
+        with pytest.raises(JWTError):
+            codec.decode(token)
+
+    @pytest.mark.parametrize(
+        "token",
+        [
+            "not-a-token",
+            "a.b.c",
+            jwt.encode({"sub": "1", "exp": 2**40}, "other", algorithm="HS256"),
+            jwt.encode({"sub": "1", "exp": 2**40}, "secret", algorithm="HS512"),
+            # headers that decode to a list and to null
+            "W10.e30.abc",
+            "bnVsbA.e30.abc",
+        ],
+    )
+    def test_invalid_tokens_are_rejected(self, token: str) -> None:
+        with pytest.raises(JWTError):
+            codec.decode(token)
+
+    def test_non_string_kid_is_rejected(self) -> None:
+        rsa_codec = JWTCodec(
+            KeyRing(
+                algorithm="RS256",
+                secret_key="unused",
+                private_key_pem=rsa.generate_private_key(
+                    public_exponent=65537, key_size=2048
+                ).private_bytes(
+                    serialization.Encoding.PEM,
+                    serialization.PrivateFormat.PKCS8,
+                    serialization.NoEncryption(),
+                ),
+            )
+        )
+        header = base64url_encode(orjson.dumps({"alg": "RS256", "kid": ["a"]}))
+
+        with pytest.raises(JWTError):
+            rsa_codec.decode(f"{header.decode()}.e30.abc")
@@ -0,0 +1,70 @@
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+
+from core.security.keys import KeyRing
+
+
+def generate_rsa_pem() -> bytes:
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048).private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+def public_pem(private_pem: bytes) -> bytes:
+    return (
+        serialization.load_pem_private_key(private_pem, password=None)
+        .public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+
+
+class TestKeyRing:
+
+    def test_symmetric_ring_publishes_no_keys(self) -> None:
+        ring = KeyRing(algorithm="HS256", secret_key="secret")
+
+        assert ring.headers is None
+        assert ring.jwks == {"keys": []}
+        assert ring.verification_key("any") == "secret"
+
+    def test_rotated_key_still_verifies(self) -> None:
+        old_pem, new_pem = generate_rsa_pem(), generate_rsa_pem()
+        old_ring = KeyRing(
+            algorithm="RS256", secret_key="unused", private_key_pem=old_pem
+        )
+        token = jwt.encode(
+            {"sub": "1"},
+            old_ring.signing_key,
+            algorithm="RS256",
+            headers=old_ring.headers,
+        )
+
+        ring = KeyRing(
+            algorithm="RS256",
+            secret_key="unused",
+            private_key_pem=new_pem,
+            previous_public_key_pems=(public_pem(old_pem),),
+        )
+        kid = jwt.get_unverified_header(token)["kid"]
+
+        assert kid == old_ring.active_kid != ring.active_kid
+        assert [key["kid"] for key in ring.jwks["keys"]] == [ring.active_kid, kid]
+        assert jwt.decode(token, ring.verification_key(kid), algorithms=["RS256"]) == {
+            "sub": "1"
+        }
+        assert "d" not in ring.jwks["keys"][0]
+
+    def test_unknown_kid_is_rejected(self) -> None:
+        ring = KeyRing(
+            algorithm="RS256", secret_key="unused", private_key_pem=generate_rsa_pem()
+        )
+
+        with pytest.raises(ValueError):
+            ring.verification_key("unknown")
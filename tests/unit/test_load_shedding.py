@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from core.config import RouteLimitConfig, SheddingConfig
+from core.exceptions import ServiceBusyError
+from core.load_shedding import LoadShedder
+
+
+def make_shedder() -> LoadShedder:
+    return LoadShedder(
+        SheddingConfig(
+            max_in_flight=4,
+            shed_thresholds={"low": 0.5, "normal": 0.75, "critical": 1.0},
+            routes={
+                "/login": RouteLimitConfig(
+                    priority="low",
+                    max_concurrency=1,
+                    max_queue=1,
+                    queue_timeout_seconds=0.01,
+                ),
+                "/refresh": RouteLimitConfig(priority="critical"),
+            },
+        )
+    )
+
+
+class TestLoadShedder:
+
+    async def test_low_priority_is_shed_first(self) -> None:
+        shedder = make_shedder()
+        for _ in range(2):
+            await shedder.acquire("/users")
+
+        with pytest.raises(ServiceBusyError):
+            await shedder.acquire("/login")
+        await shedder.acquire("/users")
+        await shedder.acquire("/refresh")
+
+        assert shedder.stats["in_flight"] == 4
+        assert shedder.stats["routes"]["/login"]["shed"] == 1
+
+    async def test_route_cap_queues_then_times_out(self) -> None:
+        shedder = make_shedder()
+        first = await shedder.acquire("/login")
+
+        waiting = asyncio.create_task(shedder.acquire("/login"))
+        await asyncio.sleep(0)
+        assert shedder.stats["routes"]["/login"]["queued"] == 1
+        assert shedder.stats["in_flight"] == 2
+        # the queue holds one waiter only
+        with pytest.raises(ServiceBusyError):
+            await shedder.acquire("/login")
+
+        with pytest.raises(ServiceBusyError):
+            await waiting
+        assert shedder.stats["routes"]["/login"]["queue_timeouts"] == 1
+        assert shedder.stats["in_flight"] == 1
+
+        shedder.release(first)
+        shedder.release(await shedder.acquire("/login"))
+        assert shedder.stats["in_flight"] == 0
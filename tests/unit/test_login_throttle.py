@@ -0,0 +1,84 @@
+import time
+
+import pytest
+
+from core.exceptions import TooManyRequestsError
+from infrastructure.cache.rate_limit import InMemoryRateLimitBackend
+from starlette.requests import Request
+
+from core.config import settings
+from services.login_throttle import LoginAttempt, LoginThrottle, client_ip
+
+attempt = LoginAttempt(ip="10.0.0.1", email="test1@example.com")
+
+
+def make_throttle() -> LoginThrottle:
+    return LoginThrottle(
+        InMemoryRateLimitBackend(max_keys=100),
+        window=60,
+        limits={"ip": 10, "email": 5, "pair": 3},
+    )
+
+
+class TestLoginThrottle:
+
+    async def test_pair_is_locked_after_limit(self, monkeypatch) -> None:
+        now = 6000.0
+        monkeypatch.setattr(time, "time", lambda: now)
+        throttle = make_throttle()
+
+        for _ in range(3):
+            await throttle.check(attempt)
+            await throttle.record_failure(attempt)
+
+        with pytest.raises(TooManyRequestsError) as exc_info:
+            await throttle.check(attempt)
+        # next window, once the 3 failures have aged below the limit
+        assert exc_info.value.retry_after == 60
+
+        other_ip = LoginAttempt(ip="10.0.0.2", email=attempt.email)
+        await throttle.check(other_ip)
+
+    async def test_window_slides(self, monkeypatch) -> None:
+        now = 6000.0
+        monkeypatch.setattr(time, "time", lambda: now)
+        throttle = make_throttle()
+        for _ in range(3):
+            await throttle.record_failure(attempt)
+
+        # halfway through the next window 1.5 failures still count
+        monkeypatch.setattr(time, "time", lambda: now + 90)
+        await throttle.check(attempt)
+
+    async def test_success_clears_email_and_pair(self) -> None:
+        throttle = make_throttle()
+        for _ in range(3):
+            await throttle.record_failure(attempt)
+
+        await throttle.record_success(attempt)
+
+        await throttle.check(attempt)
+
+
+class TestClientIp:
+
+    @staticmethod
+    def request(forwarded: str) -> Request:
+        return Request(
+            {
+                "type": "http",
+                "headers": [(b"x-forwarded-for", forwarded.encode())],
+                "client": ("10.0.0.254", 1234),
+            }
+        )
+
+    def test_spoofed_forwarded_for_is_ignored(self, monkeypatch) -> None:
+        monkeypatch.setattr(settings.throttle, "trusted_proxy_hops", 1)
+
+        # the client sent "1.2.3.4", our proxy appended the real address
+        assert client_ip(self.request("1.2.3.4, 203.0.113.7")) == "203.0.113.7"
+
+    def test_header_ignored_without_trusted_proxies(self, monkeypatch) -> None:
+        monkeypatch.setattr(settings.throttle, "trusted_proxy_hops", 0)
+
+        assert client_ip(self.request("1.2.3.4")) == "10.0.0.254"
@@ -0,0 +1,50 @@
+import aiosmtplib
+from faststream.rabbit import TestRabbitBroker
+
+from infrastructure import broker
+from infrastructure.broker.routers import mailing_consumer
+from infrastructure.broker.routers.mailing_consumer import (
+    RETRY_HEADER,
+    password_reset_metrics,
+    password_reset_queue,
+    password_reset_retry_queues,
+)
+from infrastructure.mailing.email_manager import email_manager
+from schemas.auth_schemas import ResetPasswordEmailPayloadBroker
+
+payload = ResetPasswordEmailPayloadBroker(email="test1@example.com", token="t")
+
+
+class TestMailingConsumer:
+
+    async def test_sent_email_is_measured(self, monkeypatch) -> None:
+        async def send(**kwargs) -> None:
+            pass
+
+        monkeypatch.setattr(email_manager, "send_email_reset_pass", send)
+        processed = password_reset_metrics.processed
+
+        async with TestRabbitBroker(broker):
+            await broker.publish(payload, queue=password_reset_queue)
+
+        assert password_reset_metrics.processed == processed + 1
+
+    async def test_failed_email_goes_to_retry_queue(self, monkeypatch) -> None:
+        async def send(**kwargs) -> None:
+            raise aiosmtplib.SMTPException("mailbox unavailable")
+
+        retries = []
+
+        async def retry(broker, data, attempt) -> None:
+            retries.append((data.email, attempt))
+
+        monkeypatch.setattr(email_manager, "send_email_reset_pass", send)
+        monkeypatch.setattr(mailing_consumer, "retry_or_dead_letter", retry)
+
+        async with TestRabbitBroker(broker):
+            await broker.publish(
+                payload, queue=password_reset_queue, headers={RETRY_HEADER: 2}
+            )
+
+        assert retries == [("test1@example.com", 2)]
+        assert password_reset_retry_queues[1].arguments["x-message-ttl"] == 20_000
@@ -0,0 +1,158 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from pydantic import BaseModel
+
+from services import outbox_relay as relay_module
+from services.outbox_relay import OutboxRelay, decrypt_payload, outbox_message
+
+
+class FakeOutboxRepository:
+    rows: list = []
+    deleted: list = []
+    rescheduled: list = []
+
+    def __init__(self, session) -> None:
+        pass
+
+    async def claim_batch(self, batch_size: int) -> list:
+        return self.rows[:batch_size]
+
+    async def delete_many(self, ids) -> int:
+        self.deleted.extend(ids)
+        return len(ids)
+
+    async def backlog(self) -> tuple[int, float]:
+        return len(self.rows), 12.5
+
+    async def reschedule(self, ids, delay) -> None:
+        self.rescheduled.append((ids, delay.total_seconds()))
+
+
+class FakePublisher:
+    def __init__(self) -> None:
+        self.sent: list = []
+
+    async def flush(self, batch: list) -> list:
+        self.sent.extend(item.message for item in batch)
+        return [item for item in batch if item.queue == "broken"]
+
+
+class ResetEmail(BaseModel):
+    email: str
+    token: str
+
+
+class TestOutboxRelay:
+
+    async def test_deletes_confirmed_and_backs_off_failed(self, monkeypatch) -> None:
+        @asynccontextmanager
+        async def get_session():
+            yield None
+
+        FakeOutboxRepository.rows = [
+            SimpleNamespace(id=1, payload={}, queue="ok", exchange=None, attempts=0),
+            SimpleNamespace(
+                id=2, payload={}, queue="broken", exchange=None, attempts=3
+            ),
+            SimpleNamespace(
+                id=3, payload={}, queue="broken", exchange=None, attempts=4
+            ),
+        ]
+        monkeypatch.setattr(relay_module, "OutboxRepository", FakeOutboxRepository)
+        monkeypatch.setattr(relay_module.db_helper, "get_session", get_session)
+        relay = OutboxRelay(
+            relays=1,
+            batch_size=10,
+            poll_interval=1,
+            retry_base=1,
+            retry_max=60,
+            max_attempts=5,
+            publisher=FakePublisher(),
+        )
+
+        assert await relay.relay_batch() == 3
+        assert FakeOutboxRepository.deleted == [1, 3]
+        assert FakeOutboxRepository.rescheduled == [([2], 8.0)]
+        assert relay.stats["relayed"] == 1
+        assert relay.stats["failed"] == 2
+        assert relay.stats["dropped"] == 1
+
+    def test_payload_is_stored_encrypted(self) -> None:
+        message = ResetEmail(email="a@example.com", token="raw-token")
+
+        dto = outbox_message(message, queue="q")
+
+        assert "raw-token" not in str(dto.payload)
+        assert decrypt_payload(dto.payload) == message.model_dump()
+        assert decrypt_payload({"email": "legacy"}) == {"email": "legacy"}
+
+    async def test_undecryptable_row_does_not_block_the_batch(
+        self, monkeypatch
+    ) -> None:
+        @asynccontextmanager
+        async def get_session():
+            yield None
+
+        FakeOutboxRepository.deleted = []
+        FakeOutboxRepository.rescheduled = []
+        good = outbox_message(ResetEmail(email="a@example.com", token="t"))
+        FakeOutboxRepository.rows = [
+            SimpleNamespace(
+                id=1,
+                payload={"fernet": "garbage"},
+                queue="ok",
+                exchange=None,
+                attempts=0,
+            ),
+            SimpleNamespace(
+                id=2, payload=good.payload, queue="ok", exchange=None, attempts=0
+            ),
+        ]
+        monkeypatch.setattr(relay_module, "OutboxRepository", FakeOutboxRepository)
+        monkeypatch.setattr(relay_module.db_helper, "get_session", get_session)
+        publisher = FakePublisher()
+        relay = OutboxRelay(
+            relays=1,
+            batch_size=10,
+            poll_interval=1,
+            retry_base=1,
+            retry_max=60,
+            max_attempts=5,
+            publisher=publisher,
+        )
+
+        assert await relay.relay_batch() == 2
+        assert publisher.sent == [{"email": "a@example.com", "token": "t"}]
+        assert FakeOutboxRepository.deleted == [2]
+        assert FakeOutboxRepository.rescheduled == [([1], 1.0)]
+        assert relay.stats["undecryptable"] == 1
+
+    async def test_backlog_is_read_at_most_once_per_refresh(self, monkeypatch) -> None:
+        sessions = []
+
+        @asynccontextmanager
+        async def get_session():
+            sessions.append(1)
+            yield None
+
+        FakeOutboxRepository.rows = [SimpleNamespace(id=1)]
+        monkeypatch.setattr(relay_module, "OutboxRepository", FakeOutboxRepository)
+        monkeypatch.setattr(relay_module.db_helper, "get_session", get_session)
+        relay = OutboxRelay(
+            relays=1,
+            batch_size=10,
+            poll_interval=1,
+            retry_base=1,
+            retry_max=60,
+            max_attempts=5,
+            publisher=FakePublisher(),
+            backlog_refresh=60,
+        )
+
+        await relay.refresh_backlog()
+        await relay.refresh_backlog()
+
+        assert len(sessions) == 1
+        assert relay.stats["pending"] == 1
+        assert relay.stats["oldest_age_seconds"] == 12.5
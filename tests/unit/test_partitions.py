@@ -0,0 +1,86 @@
+from contextlib import asynccontextmanager
+from datetime import date
+from types import SimpleNamespace
+
+from infrastructure.db import partitions
+from infrastructure.db.partitions import (
+    create_partition_sql,
+    drop_expired_partitions,
+    partition_name,
+)
+
+
+class FakeConnection:
+    def __init__(self, existing: dict[str, bool], locked: bool = True) -> None:
+        self.existing = existing
+        self.locked = locked
+        self.statements: list[str] = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        return SimpleNamespace(all=lambda: list(self.existing.items()))
+
+    async def scalar(self, statement, params=None):
+        self.statements.append(str(statement))
+        return self.locked
+
+
+class TestPartitions:
+
+    def test_partition_name(self) -> None:
+        assert (
+            partition_name("refresh_tokens", date(2026, 1, 9))
+            == "refresh_tokens_p20260109"
+        )
+
+    def test_partition_covers_one_utc_day(self) -> None:
+        sql = create_partition_sql("user_tokens", date(2026, 12, 31))
+
+        assert sql == (
+            "CREATE TABLE IF NOT EXISTS user_tokens_p20261231 "
+            "PARTITION OF user_tokens "
+            "FOR VALUES FROM ('2026-12-31 00:00:00+00') "
+            "TO ('2027-01-01 00:00:00+00')"
+        )
+
+    async def test_expired_partitions_are_detached_concurrently(self) -> None:
+        conn = FakeConnection(
+            {
+                "user_tokens_p20260101": False,
+                "user_tokens_p20260102": True,
+                "user_tokens_p20260110": False,
+            }
+        )
+
+        dropped = await drop_expired_partitions(conn, today=date(2026, 1, 5))
+
+        assert dropped == ["user_tokens_p20260101", "user_tokens_p20260102"]
+        assert conn.statements[1:] == [
+            "ALTER TABLE user_tokens DETACH PARTITION "
+            "user_tokens_p20260101 CONCURRENTLY",
+            "DROP TABLE IF EXISTS user_tokens_p20260101",
+            "ALTER TABLE user_tokens DETACH PARTITION "
+            "user_tokens_p20260102 FINALIZE",
+            "DROP TABLE IF EXISTS user_tokens_p20260102",
+        ]
+
+    async def test_skipped_while_another_worker_holds_the_lock(
+        self, monkeypatch
+    ) -> None:
+        conn = FakeConnection({}, locked=False)
+
+        @asynccontextmanager
+        async def get_autocommit_connection():
+            yield conn
+
+        monkeypatch.setattr(
+            partitions.db_helper,
+            "get_autocommit_connection",
+            get_autocommit_connection,
+        )
+
+        assert await partitions.maintain_partitions(days_ahead=3) == {
+            "created": [],
+            "dropped": [],
+        }
+        assert conn.statements == ["SELECT pg_try_advisory_lock(:id)"]
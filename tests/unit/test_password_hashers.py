@@ -0,0 +1,35 @@
+from core.security.password_hashers import (
+    Argon2idHasher,
+    BcryptHasher,
+    PasswordHasherRegistry,
+)
+
+# cheap parameters, the tests only exercise the plumbing
+argon2id = Argon2idHasher(time_cost=1, memory_cost=1024, parallelism=1)
+bcrypt_4 = BcryptHasher(rounds=4)
+
+
+class TestPasswordHasherRegistry:
+
+    def test_verifies_every_registered_scheme(self) -> None:
+        registry = PasswordHasherRegistry("argon2id", [argon2id, bcrypt_4])
+        legacy = bcrypt_4.hash("qwerty")
+        current = registry.hash("qwerty")
+
+        assert current.startswith("$argon2id$")
+        assert registry.verify("qwerty", legacy)
+        assert registry.verify("qwerty", current)
+        assert not registry.verify("wrong", current)
+        assert not registry.verify("qwerty", "plain-text")
+
+    def test_needs_rehash_on_other_scheme_or_stale_cost(self) -> None:
+        registry = PasswordHasherRegistry("argon2id", [argon2id, bcrypt_4])
+
+        assert registry.needs_rehash(bcrypt_4.hash("qwerty"))
+        assert not registry.needs_rehash(argon2id.hash("qwerty"))
+
+        stronger = PasswordHasherRegistry(
+            "argon2id",
+            [Argon2idHasher(time_cost=2, memory_cost=1024, parallelism=1)],
+        )
+        assert stronger.needs_rehash(argon2id.hash("qwerty"))
@@ -0,0 +1,52 @@
+import time
+
+from sqlalchemy.util import greenlet_spawn
+
+from infrastructure.db.pool_metrics import InstrumentedAsyncQueuePool, PoolStats
+
+
+class TestPoolStats:
+
+    def test_histogram_is_cumulative(self) -> None:
+        stats = PoolStats(buckets=(1, 10, 100))
+
+        for wait_ms in (0.5, 5, 5, 50, 500):
+            stats.observe(wait_ms)
+
+        assert stats.histogram == {
+            "le_1ms": 1,
+            "le_10ms": 3,
+            "le_100ms": 4,
+            "le_inf": 5,
+        }
+        assert stats.checkouts == 5
+        assert stats.wait_ms_max == 500
+
+
+class FakeDBAPIConnection:
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class TestInstrumentedAsyncQueuePool:
+
+    async def test_connect_time_is_not_counted_as_wait(self) -> None:
+        def creator() -> FakeDBAPIConnection:
+            time.sleep(0.05)
+            return FakeDBAPIConnection()
+
+        pool = InstrumentedAsyncQueuePool(creator, pool_size=1, max_overflow=0)
+        pool.stats = PoolStats()
+
+        connection = await greenlet_spawn(pool.connect)
+        await greenlet_spawn(connection.close)
+        connection = await greenlet_spawn(pool.connect)
+        await greenlet_spawn(connection.close)
+
+        assert pool.stats.connects == 1
+        assert pool.stats.connect_ms_max >= 50
+        assert pool.stats.checkouts == 2
+        assert pool.stats.wait_ms_max < 50
@@ -0,0 +1,33 @@
+import asyncio
+
+from infrastructure.broker.publisher import BatchPublisher, OutgoingMessage
+
+
+class FakeBroker:
+    def __init__(self, failing: set = frozenset(), slow: set = frozenset()) -> None:
+        self.sent: list = []
+        self.failing = failing
+        self.slow = slow
+
+    async def publish(self, message, **kwargs) -> None:
+        if message in self.slow:
+            await asyncio.sleep(1)
+        if message in self.failing:
+            raise ConnectionError("broker unavailable")
+        self.sent.append(message)
+
+
+class TestBatchPublisher:
+
+    async def test_returns_unconfirmed_messages(self) -> None:
+        broker = FakeBroker(failing={"b"}, slow={"c"})
+        publisher = BatchPublisher(broker, confirm_timeout=0.05)
+        batch = [OutgoingMessage(message=m, queue="q") for m in ("a", "b", "c")]
+
+        failed = await publisher.flush(batch)
+
+        assert [item.message for item in failed] == ["b", "c"]
+        assert broker.sent == ["a"]
+        assert publisher.stats["published"] == 1
+        assert publisher.stats["failed"] == 2
+        assert publisher.stats["batches"] == 1
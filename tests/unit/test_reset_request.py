@@ -0,0 +1,145 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from create_app import create_app
+from services import auth_service as auth_module
+from services import reset_requests as issuer_module
+from services.auth_service import AuthService
+from services.reset_requests import ResetRequestIssuer
+from infrastructure.cache import InMemoryTTLCache
+
+
+class FakeUserRepository:
+    async def find_single(self, email: str):
+        if email == "known@example.com":
+            return SimpleNamespace(id=1, email=email)
+        return None
+
+
+class FakeUserTokenRepository:
+    def __init__(self, recent: bool = False) -> None:
+        self.recent = recent
+        self.created = []
+
+    async def has_recent(self, user_id, token_type, within) -> bool:
+        return self.recent
+
+    async def create_no_return(self, dto) -> None:
+        self.created.append(dto)
+
+
+class FakeOutboxRepository:
+    def __init__(self) -> None:
+        self.created = []
+
+    async def create_no_return(self, dto) -> None:
+        self.created.append(dto)
+
+
+class FakeUnitOfWork:
+    async def commit(self) -> None:
+        pass
+
+
+class TestResetRequestCoalescing:
+
+    @staticmethod
+    def make(monkeypatch, recent: bool = False) -> AuthService:
+        monkeypatch.setattr(
+            auth_module,
+            "recent_reset_requests",
+            InMemoryTTLCache(max_size=10, ttl=60),
+        )
+        monkeypatch.setattr(auth_module.outbox_relay, "wake", lambda: None)
+        return AuthService(
+            refresh_token_repo=None,
+            user_repo=FakeUserRepository(),
+            user_token_repo=FakeUserTokenRepository(recent),
+            revoked_token_repo=None,
+            outbox_repo=FakeOutboxRepository(),
+            uow=FakeUnitOfWork(),
+        )
+
+    async def test_repeats_inside_window_are_dropped(self, monkeypatch) -> None:
+        service = self.make(monkeypatch)
+
+        await service.create_reset_token("known@example.com")
+        await service.create_reset_token("known@example.com")
+        await service.create_reset_token("unknown@example.com")
+
+        assert len(service._user_token_repo.created) == 1
+        assert len(service._outbox_repo.created) == 1
+
+    async def test_token_issued_by_another_worker(self, monkeypatch) -> None:
+        service = self.make(monkeypatch, recent=True)
+
+        await service.create_reset_token("known@example.com")
+
+        assert service._user_token_repo.created == []
+        assert service._outbox_repo.created == []
+
+
+class TestResetRequestIssuer:
+
+    def test_endpoint_answers_before_any_work(self, monkeypatch) -> None:
+        submitted = []
+        monkeypatch.setattr(
+            issuer_module.reset_request_issuer, "submit", submitted.append
+        )
+        client = TestClient(create_app())
+
+        for email in ("known@example.com", "unknown@example.com"):
+            response = client.post(
+                "/api/v1/auth/reset-password/request", json={"email": email}
+            )
+            assert response.status_code == 202
+
+        assert submitted == ["known@example.com", "unknown@example.com"]
+
+    async def test_fixed_workers_drain_a_bounded_queue(self, monkeypatch) -> None:
+        release = asyncio.Event()
+        running = 0
+        peak = 0
+        issued = []
+
+        async def issue(email: str) -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await release.wait()
+            running -= 1
+            issued.append(email)
+
+        issuer = ResetRequestIssuer(workers=2, max_pending=3)
+        monkeypatch.setattr(issuer, "_issue", issue)
+        issuer.start()
+
+        for i in range(6):
+            issuer.submit(f"{i}@example.com")
+        await asyncio.sleep(0.01)
+        release.set()
+        await issuer.stop()
+
+        assert peak == 2
+        assert len(issued) == 3
+        assert issuer.stats["lost_queue_full"] == 3
+        assert issuer.stats["lost_on_shutdown"] == 0
+
+    async def test_pending_requests_are_counted_as_lost_on_shutdown(
+        self, monkeypatch
+    ) -> None:
+        async def issue(email: str) -> None:
+            await asyncio.Event().wait()
+
+        issuer = ResetRequestIssuer(workers=1, max_pending=5)
+        monkeypatch.setattr(issuer, "_issue", issue)
+        issuer.start()
+        for i in range(3):
+            issuer.submit(f"{i}@example.com")
+        await asyncio.sleep(0.01)
+
+        await issuer.stop(timeout=0.01)
+
+        assert issuer.stats["lost_on_shutdown"] == 3
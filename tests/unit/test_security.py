@@ -1,7 +1,12 @@
+import dataclasses
 import pytest
 from datetime import datetime, timezone, timedelta
 from core.security import Security
+from core.security.authentication import check_user_is_admin, ensure_token_version
+from fastapi import HTTPException
 from infrastructure import User
+from dto.auth_dto import TokenPrincipal
+from schemas.base_schemas import UserRole
 
 user_data = User(
     id=1,
@@ -10,6 +15,10 @@ user_data = User(
     email="test1@example.com",
     phone_number="+702321311",
     hashed_password=Security.hash_password("qwerty"),
+    role=UserRole.user,
+    is_active=True,
+    is_verified=False,
+    token_version=3,
 )
 
 
@@ -47,6 +56,19 @@ class TestSecurity:
         now = datetime.now(timezone.utc).timestamp()
         assert decoded_token["exp"] > now
 
+    def test_access_token_carries_principal_claims(self):
+        token = Security.create_access_token(data=user_data)
+
+        payload = Security.decode_token(token)
+        principal = TokenPrincipal.from_payload(payload)
+
+        assert principal.id == 1
+        assert principal.role == UserRole.user
+        assert principal.is_active is True
+        assert principal.is_verified is False
+        assert principal.jti == payload["jti"]
+        assert principal.token_version == 3
+
     def test_create_refresh_token_and_decode(self):
         token = Security.create_refresh_token(
             data=user_data,
@@ -60,6 +82,7 @@ class TestSecurity:
 
         assert decoded_token["sub"] == "1"
         assert decoded_token["type"] == "refresh"
+        assert decoded_token["ver"] == 3
 
     def test_generate_reset_token_and_hashed(self):
         reset_token = Security.generate_reset_token()
@@ -74,3 +97,32 @@ class TestSecurity:
 
         another_token = Security.generate_reset_token()
         assert Security.hash_token_sha256(another_token) != hashed_reset_token
+
+    async def test_token_digest_accepts_hmac_and_legacy_bcrypt(self):
+        token = Security.generate_token()
+        digest = Security.hash_token_hmac(token)
+
+        assert digest == Security.hash_token_hmac(token)
+        assert await Security.verify_token_digest(token, digest) is True
+        assert await Security.verify_token_digest("other", digest) is False
+
+        legacy = Security.hash_password(token)
+        assert await Security.verify_token_digest(token, legacy) is True
+
+    def test_bumped_token_version_rejects_old_tokens(self):
+        payload = Security.decode_token(Security.create_access_token(data=user_data))
+
+        ensure_token_version(payload=payload, current_version=3)
+        with pytest.raises(HTTPException):
+            ensure_token_version(payload=payload, current_version=4)
+
+    def test_metrics_require_an_admin(self):
+        payload = Security.decode_token(Security.create_access_token(data=user_data))
+        principal = TokenPrincipal.from_payload(payload)
+
+        with pytest.raises(HTTPException) as exc:
+            check_user_is_admin(principal)
+        assert exc.value.status_code == 403
+
+        admin = dataclasses.replace(principal, role=UserRole.admin)
+        assert check_user_is_admin(admin) is admin
@@ -0,0 +1,150 @@
+import asyncio
+from email.message import EmailMessage
+
+import aiosmtplib
+import pytest
+
+from infrastructure.mailing.smtp_pool import SMTPConnectionPool
+
+
+class FakeSMTP:
+    def __init__(self) -> None:
+        self.is_connected = True
+        self.sent = 0
+        self.resets = 0
+        self.drop_next = False
+        self.reject_next = False
+        self.ping_started = asyncio.Event()
+        self.ping_done = asyncio.Event()
+        self.ping_done.set()
+
+    async def send_message(self, message) -> None:
+        if self.drop_next:
+            self.is_connected = False
+            raise aiosmtplib.SMTPServerDisconnected("gone")
+        if self.reject_next:
+            self.reject_next = False
+            raise aiosmtplib.SMTPRecipientsRefused([])
+        self.sent += 1
+
+    async def rset(self) -> None:
+        self.resets += 1
+
+    async def noop(self) -> None:
+        self.ping_started.set()
+        await self.ping_done.wait()
+        if not self.is_connected:
+            raise aiosmtplib.SMTPServerDisconnected("gone")
+
+    async def quit(self) -> None:
+        self.is_connected = False
+
+    def close(self) -> None:
+        self.is_connected = False
+
+
+def make_pool(monkeypatch) -> tuple[SMTPConnectionPool, list[FakeSMTP]]:
+    pool = SMTPConnectionPool(
+        host="localhost",
+        port=25,
+        username=None,
+        password=None,
+        use_tls=False,
+        size=2,
+        keepalive_interval=60,
+        timeout=5,
+    )
+    clients = []
+
+    async def connect() -> FakeSMTP:
+        clients.append(FakeSMTP())
+        pool.opened += 1
+        return clients[-1]
+
+    monkeypatch.setattr(pool, "_connect", connect)
+    return pool, clients
+
+
+class TestSMTPConnectionPool:
+
+    async def test_connection_is_reused(self, monkeypatch) -> None:
+        pool, clients = make_pool(monkeypatch)
+
+        for _ in range(3):
+            await pool.send_message(EmailMessage())
+
+        assert len(clients) == 1
+        assert clients[0].sent == 3
+        assert pool.stats["idle"] == 1
+
+    async def test_reconnects_after_disconnect(self, monkeypatch) -> None:
+        pool, clients = make_pool(monkeypatch)
+        await pool.send_message(EmailMessage())
+        clients[0].drop_next = True
+
+        await pool.send_message(EmailMessage())
+
+        assert len(clients) == 2
+        assert clients[1].sent == 1
+        assert pool.stats["discarded"] == 1
+
+    async def test_keepalive_drops_dead_idle_connections(self, monkeypatch) -> None:
+        pool, clients = make_pool(monkeypatch)
+        await pool.send_message(EmailMessage())
+        clients[0].is_connected = False
+
+        await pool._keepalive()
+
+        assert pool.stats["idle"] == 0
+        assert pool.stats["keepalive_failures"] == 1
+
+    async def test_rejected_message_resets_connection(self, monkeypatch) -> None:
+        pool, clients = make_pool(monkeypatch)
+        await pool.send_message(EmailMessage())
+        clients[0].reject_next = True
+
+        with pytest.raises(aiosmtplib.SMTPRecipientsRefused):
+            await pool.send_message(EmailMessage())
+
+        assert clients[0].resets == 1
+        assert pool.stats["idle"] == 1
+        assert pool.stats["failed"] == 1
+
+    async def test_keepalive_counts_against_pool_size(self, monkeypatch) -> None:
+        pool, clients = make_pool(monkeypatch)
+        async with pool.connection(), pool.connection():
+            pass
+        assert len(clients) == 2
+        clients[1].ping_done.clear()
+
+        keepalive = asyncio.create_task(pool._keepalive())
+        await clients[1].ping_started.wait()
+        sends = [asyncio.create_task(pool.send_message(EmailMessage()))]
+        sends.append(asyncio.create_task(pool.send_message(EmailMessage())))
+        await asyncio.sleep(0.01)
+        clients[1].ping_done.set()
+        await asyncio.gather(keepalive, *sends)
+
+        assert len(clients) == 2
+        assert clients[0].sent + clients[1].sent == 2
+
+    async def test_cancelled_send_discards_connection(self, monkeypatch) -> None:
+        pool, clients = make_pool(monkeypatch)
+        await pool.send_message(EmailMessage())
+        started = asyncio.Event()
+
+        async def send_message(message) -> None:
+            started.set()
+            await asyncio.Event().wait()
+
+        monkeypatch.setattr(clients[0], "send_message", send_message)
+        task = asyncio.create_task(pool.send_message(EmailMessage()))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert not clients[0].is_connected
+        assert pool.stats["idle"] == 0
+        assert pool.stats["discarded"] == 1
+        assert pool.stats["in_use"] == 0
@@ -0,0 +1,55 @@
+import asyncio
+
+from services import token_sweeper as sweeper_module
+from services.token_sweeper import ExpiredTokenSweeper
+
+
+class TestExpiredTokenSweeper:
+
+    async def test_sweeps_in_batches_until_short_batch(self, monkeypatch) -> None:
+        sweeper = ExpiredTokenSweeper(
+            interval=60, jitter=0, batch_size=100, batch_pause=0
+        )
+        batches = {
+            "refresh_tokens": [100, 100, 42],
+            "user_tokens": [7],
+            "revoked_tokens": [0],
+        }
+
+        async def fake_delete_batch(repo_factory) -> int:
+            table = next(
+                name
+                for name, factory in sweeper.repositories.items()
+                if factory is repo_factory
+            )
+            return batches[table].pop(0)
+
+        monkeypatch.setattr(sweeper, "_delete_batch", fake_delete_batch)
+
+        result = await sweeper.run_once()
+
+        assert result == {"refresh_tokens": 242, "user_tokens": 7, "revoked_tokens": 0}
+        assert sweeper.stats["runs"] == 1
+        assert sweeper.stats["total_deleted"] == result
+
+    async def test_partitions_are_maintained_before_the_first_sleep(
+        self, monkeypatch
+    ) -> None:
+        sweeper = ExpiredTokenSweeper(
+            interval=300,
+            jitter=0,
+            batch_size=100,
+            batch_pause=0,
+            manage_partitions=True,
+        )
+        maintained = asyncio.Event()
+
+        async def maintain_partitions(days_ahead: int) -> dict:
+            maintained.set()
+            return {"created": [], "dropped": []}
+
+        monkeypatch.setattr(sweeper_module, "maintain_partitions", maintain_partitions)
+
+        sweeper.start()
+        await asyncio.wait_for(maintained.wait(), 1)
+        await sweeper.stop()
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from infrastructure.cache import InMemoryTTLCache, UserCache
+from infrastructure.repo import user_repo
+from infrastructure.repo.base_sqlalchemy_repo import BaseSqlalchemyRepo
+from infrastructure.repo.user_repo import UserRepository
+from schemas.base_schemas import AuthEventTypeEnum
+
+
+class FakeSession:
+    def __init__(self, rowcount: int) -> None:
+        self.rowcount = rowcount
+        self.statements: list[str] = []
+        self.info: dict = {}
+
+    async def execute(self, statement):
+        self.statements.append(
+            str(statement.compile(dialect=postgresql.asyncpg.dialect()))
+        )
+        return SimpleNamespace(rowcount=self.rowcount)
+
+
+class TestReplacePasswordHash:
+
+    async def test_lost_update_is_not_overwritten(self) -> None:
+        # a password change committed after the login verified the old hash
+        session = FakeSession(rowcount=0)
+        cache = UserCache(InMemoryTTLCache(max_size=10, ttl=60))
+        await cache.set({"id": 1, "email": "a@example.com", "hashed_password": "new"})
+        repo = UserRepository(session, cache=cache)
+
+        replaced = await repo.replace_password_hash(
+            user_id=1, old_hashed_password="old", new_hashed_password="rehashed"
+        )
+
+        assert not replaced
+        assert (
+            "WHERE users.id = $2::INTEGER AND users.hashed_password = $3::VARCHAR"
+            in session.statements[0]
+        )
+        assert await cache.get_by_id(1) is not None
+
+
+class TestSetPassword:
+
+    async def test_password_and_token_version_in_one_update(self, monkeypatch) -> None:
+        session = FakeSession(rowcount=1)
+        repo = UserRepository(session)
+        invalidated = []
+
+        async def invalidate(user_id: int, email: str | None = None) -> None:
+            invalidated.append(user_id)
+
+        monkeypatch.setattr(repo, "invalidate", invalidate)
+
+        await repo.set_password(user_id=1, hashed_password="new")
+
+        assert len(session.statements) == 1
+        assert (
+            "SET hashed_password=$1::VARCHAR, token_version=(users.token_version + $2::INTEGER)"
+            in session.statements[0]
+        )
+        assert invalidated == [1]
+
+
+class TestBulkInvalidation:
+
+    async def test_delete_many_publishes_one_flush(self, monkeypatch) -> None:
+        session = FakeSession(rowcount=3)
+        cache = UserCache(InMemoryTTLCache(max_size=10, ttl=60))
+        for user_id in (1, 2, 3):
+            await cache.set({"id": user_id, "email": f"{user_id}@example.com"})
+        repo = UserRepository(session, cache=cache)
+        published = []
+
+        async def delete_many(self, ids, **kwargs) -> int:
+            return len(ids)
+
+        async def publish_auth_event(payload) -> None:
+            published.append(payload)
+
+        monkeypatch.setattr(BaseSqlalchemyRepo, "delete_many", delete_many)
+        monkeypatch.setattr(repo, "_pending_invalidations", lambda: {})
+        monkeypatch.setattr(user_repo, "publish_auth_event", publish_auth_event)
+
+        assert await repo.delete_many([1, 2, 3]) == 3
+        assert session.info["user_cache_flush"]
+        assert await cache.get_by_id(1) is None
+
+        await repo._after_commit({}, flush=True)
+
+        assert [p.event for p in published] == [AuthEventTypeEnum.users_flushed]